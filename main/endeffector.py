@@ -1,4 +1,6 @@
 from libraries.peripheral._opencr import OpenCRSerial
+from libraries.peripheral._scheduler import CommandScheduler
+from libraries.control._harvest import HarvestState, HarvestStateMachine
 import time
 
 class endeffectorCTL():
@@ -7,8 +9,31 @@ class endeffectorCTL():
         self.DEVICENAME                  = '/dev/ttyACM0'
         self.timeout                     = 1.0
         self.devaddr                     = 0xf0
+        self.sequenced                   = False    # True : 시퀀스 번호 프로토콜(시퀀스 바이트를 돌려주는 펌웨어 필요), 여러 명령을 응답 대기 없이 연달아 전송
 
-        self.oc = OpenCRSerial(self.DEVICENAME, self.BAUDRATE, self.timeout, self.devaddr)
+        self.oc = OpenCRSerial(self.DEVICENAME, self.BAUDRATE, self.timeout, self.devaddr, self.sequenced)
+        # 모든 명령은 스케줄러를 거쳐 실행: 센서 폴링 스레드와 동작 명령이 섞이지 않고, 정지/절단 명령이 먼저 실행됨
+        self.scheduler = CommandScheduler()
+
+        # 스트리밍 모드: OpenCR이 주기적으로 센서 값을 push, 이 시간(s)보다 오래된 샘플은 사용하지 않음
+        # push 스트림 펌웨어에서만 True, False거나 스트림 시작에 실패하면 get_sensors()가 요청/응답으로 폴링
+        self.use_stream                  = False
+        self.stream_max_age              = 0.1
+
+        # 일괄 명령 펌웨어(sensors 0x08, syncGoalPosition 0x0C, syncPresentPosition 0x0D, syncMovingStatus 0x0E)에서만 True
+        # False면 기존 펌웨어 명령(모터별 goalPosition/getPresentPositionData, tdtl/microphoto_*)만 사용하고,
+        # moving 레지스터 대신 위치 변화로 정지를 판단
+        self.use_batch                   = False
+        self.still_tolerance             = 2        # 연속 두 번 읽은 위치 차가 이 이하면 정지로 봄 (use_batch=False)
+        self.start_delay                 = 0.3      # 목표 전송 후 이 시간(s) 동안은 움직이는 중으로 봄 (use_batch=False)
+        self.__last_positions            = {}
+        self.__goal_at                   = 0.0
+
+        # 다이나믹셀 목표 위치 (11: 집게, 13: 와이어)
+        self.GRIP_OPEN                   = 2048
+        self.GRIP_CLOSE                  = 950
+        self.WIRE_RELEASE                = 2500
+        self.WIRE_PULL                   = 3000
 
         # 속도 0~1023
         dxl11_velocity     = 200
@@ -16,77 +41,195 @@ class endeffectorCTL():
         dxl13_velocity     = 200
         dxl13_acceleration = 0
 
-        self.oc.dxl_init(11, dxl11_velocity, dxl11_acceleration)
-        self.oc.dxl_init(13, dxl13_velocity, dxl13_acceleration)
+        self.send_all(self.oc.VALUE_FUNCCODE_dxl_init, [(11, dxl11_velocity, dxl11_acceleration),
+                                                         (13, dxl13_velocity, dxl13_acceleration)])
+
+    def call(self, priority, fn, *args):
+        # 스케줄러에 예약하고 완료까지 대기, 비동기로 쓰려면 self.scheduler.submit()의 Future 사용
+        return self.scheduler.submit(priority, fn, *args).result()
+
+    def __send_all(self, funccode, args_list):
+        pendings = [self.oc.send(funccode, *args) for args in args_list]
+        return [p.result() for p in pendings]
+
+    def send_all(self, funccode, args_list, priority=CommandScheduler.PRIORITY_MOTION):
+        # 명령들을 응답 대기 없이 연달아 보낸 뒤 응답을 한꺼번에 확인
+        return self.call(priority, self.__send_all, funccode, args_list)
+
+    def goal_positions(self, targets, priority=CommandScheduler.PRIORITY_MOTION):
+        # targets: [(id, position), ...], use_batch면 한 프레임으로, 아니면 모터별 명령을 연달아 전송
+        self.__goal_at = time.monotonic()
+        if self.use_batch:
+            self.call(priority, self.oc.dxl_syncGoalPosition, targets)
+        else:
+            self.send_all(self.oc.VALUE_FUNCCODE_dxl_goalPosition, targets, priority)
 
     def home(self):
-        self.oc.dxl_goalPosition(11, 2048)
-        time.sleep(2)
-        self.oc.dxl_goalPosition(13, 2500)
+        # 11번, 13번 원위치
+        self.goal_positions([(11, self.GRIP_OPEN), (13, self.WIRE_RELEASE)])
 
     def grasp_stem(self):
-        self.oc.dxl_goalPosition(11, 950)  # 음수 = 시계방향, 양수 = 반시계방향
+        self.goal_positions([(11, self.GRIP_CLOSE)], CommandScheduler.PRIORITY_URGENT)  # 음수 = 시계방향, 양수 = 반시계방향
         
     def release_stem(self):
-        self.oc.dxl_goalPosition(11, 2048)  # 음수 = 시계방향, 양수 = 반시계방향
+        self.goal_positions([(11, self.GRIP_OPEN)])  # 음수 = 시계방향, 양수 = 반시계방향
 
     def pull_wire(self):
-        self.oc.dxl_goalPosition(13, 3000)
+        self.goal_positions([(13, self.WIRE_PULL)], CommandScheduler.PRIORITY_URGENT)
 
     def release_wire(self):
-        self.oc.dxl_goalPosition(13, 2500)
+        self.goal_positions([(13, self.WIRE_RELEASE)])
+
+    def cut(self):
+        # pull_wire + release_stem
+        self.goal_positions([(13, self.WIRE_PULL), (11, self.GRIP_OPEN)], CommandScheduler.PRIORITY_URGENT)
+
+    def get_positions(self, ids=(11, 13)):
+        if self.use_batch:
+            return self.call(CommandScheduler.PRIORITY_POLL, self.oc.dxl_syncPresentPosition, ids)
+        return [self.call(CommandScheduler.PRIORITY_POLL, self.oc.dxl_getPresentPositionData, id) for id in ids]
+
+    def get_moving_status(self, ids=(11, 13)):
+        # [(moving, position), ...]
+        if self.use_batch:
+            return self.call(CommandScheduler.PRIORITY_POLL, self.oc.dxl_syncMovingStatus, ids)
+
+        # moving 레지스터가 없는 펌웨어: 목표 전송 직후가 아니고 위치가 이전 조회와 같으면 정지
+        positions = self.get_positions(ids)
+        starting = time.monotonic() - self.__goal_at < self.start_delay
+        status = []
+        for id, position in zip(ids, positions):
+            prev = self.__last_positions.get(id)
+            still = not starting and prev is not None and abs(position - prev) <= self.still_tolerance
+            self.__last_positions[id] = position
+            status.append((0 if still else 1, position))
+        return status
+
+    def wait_all_reached(self, targets, tolerance=20, timeout=2.0, interval=0.01):
+        """
+        targets: {id: position}
+        모든 모터가 목표 위치 ±tolerance에 도달하거나 멈추면(moving == 0) 즉시 반환
+        return: 목표 위치에 도달했으면 True, 멈췄지만 위치가 다르거나(막힘) timeout이면 False
+        """
+        ids = list(targets)
+        deadline = time.monotonic() + timeout
+        while True:
+            status = self.get_moving_status(ids)
+            reached = [abs(position - targets[id]) <= tolerance for id, (_, position) in zip(ids, status)]
+            if all(reached):
+                return True
+            if all(r or moving == 0 for r, (moving, _) in zip(reached, status)):
+                return False
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(interval)
+
+    def wait_until_reached(self, id, target, tolerance=20, timeout=2.0):
+        return self.wait_all_reached({id: target}, tolerance, timeout)
+
+    def wait_until_home(self, timeout=3.0):
+        return self.wait_all_reached({11: self.GRIP_OPEN, 13: self.WIRE_RELEASE}, timeout=timeout)
+
+    def start_stream(self, period_ms=10):
+        # 이후 센서 조회는 시리얼 통신 없이 최신 push 샘플을 읽음, 스트리밍을 시작했으면 True
+        if not self.use_stream:
+            return False
+        try:
+            self.oc.stream_start(period_ms)
+        except Exception as e:
+            print(f"Sensor stream unavailable, polling instead: {e!r}")
+            return False
+        return True
+
+    def stop_stream(self):
+        self.oc.stream_stop()
+
+    def __latest_sample(self):
+        if self.oc.stream is None:
+            return None
+        return self.oc.stream.get(self.stream_max_age)
 
     def get_micro_photo(self):
-        photo1 = self.oc.microphoto_1()[0]
-        photo2 = self.oc.microphoto_2()[0]
+        sample = self.__latest_sample()
+        if sample is not None:
+            return [sample.microphoto_1, sample.microphoto_2]
+
+        photo1 = self.call(CommandScheduler.PRIORITY_POLL, self.oc.microphoto_1)[0]
+        photo2 = self.call(CommandScheduler.PRIORITY_POLL, self.oc.microphoto_2)[0]
 
         return [photo1, photo2]
     
     def get_TDTL(self):
-        return self.oc.tdtl()[0]
+        sample = self.__latest_sample()
+        if sample is not None:
+            return sample.tdtl
 
-    def run(self):
-        # home, grasp, pull_wire
-        mode = "home"
+        return self.call(CommandScheduler.PRIORITY_POLL, self.oc.tdtl)[0]
+
+    def get_sensors(self):
+        sample = self.__latest_sample()
+        if sample is not None:
+            return [sample.microphoto_1, sample.microphoto_2, sample.tdtl]
+
+        if not self.use_batch:
+            [micro1, micro2] = self.get_micro_photo()
+            return [micro1, micro2, self.get_TDTL()]
+
+        # 한 번의 통신으로 [micro1, micro2, tdtl] 읽기
+        micro1, micro2, tdtl = self.call(CommandScheduler.PRIORITY_POLL, self.oc.sensors)
 
+        return [micro1, micro2, tdtl]
+
+    def harvest_fsm(self, actions=None, tolerance=20):
+        # 수확 상태 기계 생성, actions로 상태 진입 동작을 덮어쓸 수 있음 (예: 로봇 정지 후 파지)
+        default_actions = {
+            HarvestState.GRASP:   self.grasp_stem,
+            HarvestState.CUT:     self.cut,
+            HarvestState.RELEASE: self.release_wire,
+        }
+        targets = {
+            HarvestState.GRASP:   {11: self.GRIP_CLOSE},
+            HarvestState.CUT:     {13: self.WIRE_PULL, 11: self.GRIP_OPEN},
+            HarvestState.RELEASE: {13: self.WIRE_RELEASE},
+        }
+        return HarvestStateMachine({**default_actions, **(actions or {})}, targets, tolerance)
+
+    def step(self, fsm):
+        # 센서 값(과 도달 확인이 필요한 모터 위치)을 읽어 상태 기계 갱신, 상태가 바뀌면 True
+        [micro1, micro2, tdtl] = self.get_sensors()
+        positions, moving = None, None
+        if fsm.pending_ids:
+            status = self.get_moving_status(fsm.pending_ids)
+            moving = {id: m for id, (m, _) in zip(fsm.pending_ids, status)}
+            positions = {id: p for id, (_, p) in zip(fsm.pending_ids, status)}
+
+        return fsm.update(micro1, micro2, tdtl, positions, moving)
+
+    def run(self):
         self.home()
-        time.sleep(2)
+        self.wait_until_home()
+        self.start_stream()
+        fsm = self.harvest_fsm()
         print("Start")
 
         while True:
             try:
-                tdtl = self.get_TDTL()
-                [micro1, micro2] = self.get_micro_photo()
-                print(micro1)
-                print(micro2)
-                print(tdtl)
-
-                if mode == 'home':
-                    if tdtl == 1:
-                        self.grasp_stem()
-                        time.sleep(1)
-                        mode = "grasp"
-                elif mode == 'grasp':
-                    if micro1 == 0 or micro2 == 0:
-                        self.pull_wire()
-                        time.sleep(1)
-                        self.release_stem()
-                        time.sleep(1)
-                        mode = "pull_wire"
-                elif mode == "pull_wire":
+                if self.step(fsm):
+                    print(fsm.state)
+
+                if fsm.state == HarvestState.CUT and fsm.settled:
                     cha = input('a 입력: ')
                     if cha == "a":
-                        self.release_wire()
-                        time.sleep(1)
-                        mode = "home"
-                    
-                time.sleep(0.1)
+                        fsm.release()
+
+                time.sleep(0.01)
             except KeyboardInterrupt:
                 print("초기화")
+                self.stop_stream()
                 self.home()
-                time.sleep(2)
-                self.oc.dxl_torqueOff(11)
-                self.oc.dxl_torqueOff(13)
+                self.wait_until_home()
+                self.send_all(self.oc.VALUE_FUNCCODE_dxl_torqueOff, [(11,), (13,)])
+                self.scheduler.close()
                 time.sleep(1)
                 print("종료")
                 break
@@ -1,16 +1,39 @@
 from endeffector import endeffectorCTL
+from libraries.control._harvest import HarvestState
+from libraries.control._rate import Rate, Deadline
+from libraries.control._monitor import Monitor
+from libraries.transform import HandEye, compose_pose
+from utils.harvest_plan import plan_harvest_order
 from neuromeka import IndyDCP2
+import numpy as np
+import threading
 import time
 import math
 
 class indyCTL():
-    def __init__(self):
+    def __init__(self, mock=False):
         
         self.robot_ip = "192.168.0.xx"               # 로봇 컨트롤 박스의 IP 주소
         self.robot_name = 'NRMK-Indy7'              # 로봇 이름
-        self.indy = IndyDCP2(server_ip=self.robot_ip, robot_name=self.robot_name)
-        self.endeffector = endeffectorCTL()
-
+        if mock:
+            # 하드웨어 없이 실행 (녹화 재생으로 비전 경로 벤치마크 등), 수확 루프는 그대로 동작
+            from mock_backend import indyDCPMock, endeffectorMock
+            self.indy = indyDCPMock(server_ip=self.robot_ip, robot_name=self.robot_name)
+            self.endeffector = endeffectorMock()
+        else:
+            self.indy = IndyDCP2(server_ip=self.robot_ip, robot_name=self.robot_name)
+            self.endeffector = endeffectorCTL()
+        self.endeffector.start_stream()             # use_stream이면 센서 값을 OpenCR push 스트림으로 수신, 아니면 폴링
+
+        self.lock = threading.RLock()               # 상태 모니터 스레드와 동작 명령이 같은 DCP 연결을 공유
+        self.loop_hz = 100                          # 수확 루프 주기(Hz)
+        self.status_hz = 20                         # 로봇 상태 샘플링 주기(Hz)
+        self.harvest_timeout = 30.0                 # 잎 하나 수확 제한 시간(s)
+        self.approach_joint = [0,0,-90,0,-90,0]     # 수확 대기 자세(관절 각도)
+        self.__approach_task = None                 # 수확 대기 자세의 작업 좌표, 연속 수확 시 절대 목표 계산에 사용
+        self.batch_optimize = False                 # True : 연속 수확에서 행 순서만 지키고 행 안 이동 거리를 최소화 (행을 오른쪽부터 훑을 수 있음)
+        self.handeye = HandEye.load("calib/handeye.npz")    # 카메라 -> 로봇 변환, 파일이 없으면 기존 상수와 같은 기본값
+        self.side_offset = 0.26                     # 잎 옆에서 접근하기 위한 측면 거리(m)
 
         self.indy.connect()                         # 연결
         self.indy.reset_robot()
@@ -24,69 +47,98 @@ class indyCTL():
         self.indy.wait_for_move_finish()
         print("Ready")
 
-    def run(self, x=0, y=0, z=0, angle=0):
+    def to_robot(self, points):
+        '''
+        (N,3) 카메라 좌표(m) -> (N,3) 수확 대기 자세 기준 이동량(m), 한 번에 변환
+        '''
+        pts = np.asarray(points, dtype=float).reshape(-1, 3)
+        target = np.round(self.handeye.camera_to_robot(pts), 4)
+        target[pts[:, 2] < -0.24, 2] = -0.24
+        return target
+
+    def run(self, x=0, y=0, z=0, angle=0, home=True):
+        '''
+        잎 하나 수확, 성공하면 True
+        home=False면 대기 자세를 거치지 않고 현재 위치에서 바로 접근 위치로 이동하고, 수확 후에도 돌아가지 않음 (run_batch용)
+        '''
+        return self.harvest(self.to_robot([x, y, z])[0], angle, home)
+
+    def harvest(self, target, angle=0, home=True):
+        '''
+        target: to_robot()으로 변환한 대기 자세 기준 이동량 [mx, my, mz]
+        '''
         self.endeffector.home()
-        mx = -float(format(x-0.32, ".4f"))
-        my = +float(format(y, ".4f"))
+        mx, my, mz = (float(t) for t in target)
 
         print(angle)
 
-        X = -0.26*math.cos(math.radians(angle))
-        Y = 0.26*math.sin(math.radians(angle))
-        Z = (z-0.32)+0.08
+        X = -self.side_offset*math.cos(math.radians(angle))
+        Y = self.side_offset*math.sin(math.radians(angle))
 
-        print("mx: ", mx, " my: ", my, "z: ", z)
+        print("mx: ", mx, " my: ", my, "mz: ", mz)
         print("X:", X, "Y: ", Y, "Angle: ", angle)
 
         move_count = 0
-        mode = "home"
+        fsm = self.endeffector.harvest_fsm(actions={
+            HarvestState.GRASP: self.__grasp,
+            HarvestState.CUT:   self.__cut,
+        })
 
-        self.indy.joint_move_to([0,0,-90,0,-90,0])
-        self.indy.wait_for_move_finish()
-        if z < -0.24:
-            self.indy.task_move_by([mx+X,my+Y,-0.24,0,0,angle])
+        # 대기 자세 기준 상대 이동량 (도구 좌표계)
+        offset = [mx+X,my+Y,mz,0,0,angle]
+
+        if home or self.__approach_task is None:
+            self.go_approach()
+            self.indy.task_move_by(offset)
         else:
-            self.indy.task_move_by([mx+X,my+Y,-Z,0,0,angle])
+            # 대기 자세의 작업 좌표에 도구 좌표계 이동량을 합성한 절대 목표로 바로 이동 (대기 자세 경유와 같은 위치)
+            self.indy.task_move_to(compose_pose(self.__approach_task, offset))
         self.indy.wait_for_move_finish()
-        status = self.indy.get_robot_status().get('busy')
-
-        while True:
-            if mode == "home":
-                tdtl = self.endeffector.get_TDTL()
-
-                if tdtl == 1:
-                    print('stop')
-                    self.indy.stop_motion()
-                    self.endeffector.grasp_stem()
-                    mode = "grasp"
-                    time.sleep(1)
-
-                if status == 0 and move_count == 0:
-                    print("Move")
-                    self.indy.task_move_by([-X,-Y,0,0,0,0])
-                    move_count=1
-
-            if mode == "grasp":
-                [micro1, micro2] = self.endeffector.get_micro_photo()
-
-                if micro1 == 0 or micro2 == 0:
-                    self.indy.stop_motion()
-                    self.endeffector.pull_wire()
-                    time.sleep(1)
-                    self.endeffector.release_stem()
-                    time.sleep(1)
-                    self.indy.task_move_by([-0.07,0,0,0,0,0])
-                    self.indy.wait_for_move_finish()
-                    self.indy.joint_move_to([0,0,-90,0,-90,0])
-                    self.indy.wait_for_move_finish()
-                    break
-
-                if move_count == 1:
-                    self.indy.task_move_by([0,0,0.1,0,0,0])
-                    move_count = 2
-
-            # status = self.indy.get_robot_status().get('busy')
-            
+
+        # 로봇 상태는 별도 스레드에서 주기적으로, 엔드이펙터 센서는 OpenCR 스트림으로 받고
+        # 루프는 loop_hz로 쉬어가며 돌아 비전 추론에 CPU를 양보
+        monitor = Monitor().add('status', self.__robot_status, self.status_hz).start()
+        rate = Rate(self.loop_hz)
+        deadline = Deadline(self.harvest_timeout)
+        done = False
+
+        try:
+            while not deadline.expired():
+                self.endeffector.step(fsm)
+                status = monitor.get('status')
+                busy = None if status is None else status.value.get('busy')
+
+                if fsm.state == HarvestState.HOME:
+                    if busy == 0 and move_count == 0:
+                        print("Move")
+                        self.__move_by([-X,-Y,0,0,0,0])
+                        move_count=1
+
+                elif fsm.state == HarvestState.GRASP:
+                    # 집게가 닫힌 것을 확인한 뒤 위로 이동하며 잎자루 탐색
+                    if fsm.settled and move_count == 1:
+                        self.__move_by([0,0,0.1,0,0,0])
+                        move_count = 2
+
+                elif fsm.state == HarvestState.CUT:
+                    # 절단 동작 완료(위치 도달) 후 후퇴
+                    if fsm.settled:
+                        done = True
+                        break
+
+                rate.sleep()
+        finally:
+            monitor.stop()
+
+        if done:
+            self.indy.task_move_by([-0.07,0,0,0,0,0])
+            self.indy.wait_for_move_finish()
+        else:
+            print("Timeout")
+            self.indy.stop_motion()
+            self.endeffector.home()
+        if home or not done:
+            self.go_approach()
 
         # self.indy.task_move_by([-float(format(y, ".4f"))+0.22,-float(format(x, ".4f")),0,0,0,0])
 
@@ -95,16 +147,66 @@ class indyCTL():
 
         # self.indy.wait_for_move_finish()
         time.sleep(0.5)
+        return done
+
+    def run_batch(self, targets):
+        '''
+        한 프레임에서 검출한 잎 여러 개를 연속 수확
+        targets: [(x, y, z, angle), ...] 카메라 좌표(m)와 각도
+        좌하단 -> 우상단 순서(아래 행부터, 행 안에서는 왼쪽부터, batch_optimize면 행 안은 최단 경로)로 정렬하고,
+        좌표 변환은 한 번에 수행, 대기 자세에는 시작과 끝에 한 번씩만 들름 (잎 사이는 task_move_to로 바로 이동)
+        return: targets 순서의 성공 여부 리스트
+        '''
+        results = [False] * len(targets)
+        if not targets:
+            return results
+
+        points = [t[:3] for t in targets]
+        order = plan_harvest_order(points, optimize=self.batch_optimize)
+        print("Harvest order: ", order)
+
+        robot = self.to_robot(points)               # 모든 잎을 한 번에 변환
+        self.go_approach()
+        for i in order:
+            results[i] = self.harvest(robot[i], targets[i][3], home=False)
+        self.go_approach()
+        return results
+
+    def go_approach(self):
+        self.indy.joint_move_to(self.approach_joint)
+        self.indy.wait_for_move_finish()
+        if self.__approach_task is None:
+            self.__approach_task = self.indy.get_task_pos()
+
+    def __robot_status(self):
+        with self.lock:
+            return self.indy.get_robot_status()
+
+    def __move_by(self, target):
+        with self.lock:
+            self.indy.task_move_by(target)
+
+    def __grasp(self):
+        print('stop')
+        with self.lock:
+            self.indy.stop_motion()
+        self.endeffector.grasp_stem()
+
+    def __cut(self):
+        with self.lock:
+            self.indy.stop_motion()
+        self.endeffector.cut()
 
     def go_home(self):
         self.endeffector.home()
         self.indy.joint_move_to([0,0,-90,0,0,0])
         self.indy.wait_for_move_finish()
-        time.sleep(2)
+        self.endeffector.wait_until_home()
         print("Ready")
 
     def close(self):
         self.go_home()
+        self.endeffector.stop_stream()
         self.indy.go_home()
         self.indy.wait_for_move_finish()
         print("Task Pos: ", self.indy.get_task_pos())
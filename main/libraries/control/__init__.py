@@ -0,0 +1,14 @@
+'''
+본 프로젝트에서 사용하는 수확 동작 제어 로직 제공 모듈
+하드웨어와 무관하게 센서 값/위치 피드백만으로 동작합니다
+'''
+
+
+
+__all__ = ['HarvestState', 'HarvestStateMachine', 'Rate', 'Deadline', 'Monitor', 'Sample']
+
+
+
+from ._harvest import HarvestState, HarvestStateMachine
+from ._rate import Rate, Deadline
+from ._monitor import Monitor, Sample
\ No newline at end of file
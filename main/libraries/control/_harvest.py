@@ -0,0 +1,121 @@
+### Imports ###
+from enum import Enum
+from typing import Callable, Dict, Mapping, Optional, Sequence
+
+
+### Class ###
+class HarvestState(Enum):
+    HOME    = 'home'        # 줄기 진입 대기 (집게 열림, 와이어 풀림)
+    GRASP   = 'grasp'       # 줄기 파지, 잎자루 통과 대기
+    CUT     = 'cut'         # 와이어 인장으로 절단 + 파지
+    RELEASE = 'release'     # 와이어 해제, 원위치 복귀
+
+
+class HarvestStateMachine:
+    '''
+    엔드이펙터 수확 시퀀스 상태 기계 (home -> grasp -> cut -> release -> home)
+    고정 시간 대기 대신 아래 이벤트로 상태를 넘깁니다.
+      HOME    -> GRASP   : TDTL 상승 에지(0 -> 1)
+      GRASP   -> CUT     : 집게가 목표 위치에 도달한 뒤, 마이크로 포토센서 하강 에지(1 -> 0)
+                           (GRASP 진입 시 이미 0이었으면 에지 없이 0인 동안)
+      CUT     -> RELEASE : 절단 동작이 목표 위치에 도달한 뒤 release() 호출
+      RELEASE -> HOME    : 와이어가 목표 위치에 도달
+    상태에 진입할 때 actions[state]()를 호출하며, targets[state]의 모든 모터가 {id: position}에
+    tolerance 이내로 도달하거나 멈추면(moving == 0, 예: 집게가 줄기에 막힘) 해당 상태가 settled 됩니다.
+    '''
+    def __init__(self,
+                 actions: Mapping[HarvestState, Callable[[], None]],
+                 targets: Mapping[HarvestState, Mapping[int, int]],
+                 tolerance: int = 20):
+        self.__actions      = dict(actions)
+        self.__targets      = {state: dict(target) for state, target in targets.items()}
+        self.__tolerance    = tolerance
+        
+        self.__state        = HarvestState.HOME
+        self.__settled      = True
+        self.__prev_tdtl    = None
+        self.__prev_micro   = None
+        self.__micro_fell   = False     # GRASP 진입 후 집게가 닫히는 동안 발생한 하강 에지
+    
+    
+    
+    @property
+    def state(self) -> HarvestState:
+        return self.__state
+    
+    @property
+    def settled(self) -> bool:
+        '''현재 상태의 모터 목표 위치에 모두 도달했는지 여부'''
+        return self.__settled
+    
+    @property
+    def pending_ids(self) -> Sequence[int]:
+        '''아직 도달 확인이 필요한 모터 id. 비어 있으면 위치를 읽지 않아도 됩니다.'''
+        if self.__settled:
+            return ()
+        return tuple(self.__targets.get(self.__state, {}))
+    
+    def reached(self, positions: Mapping[int, int], moving: Optional[Mapping[int, int]] = None) -> bool:
+        target = self.__targets.get(self.__state, {})
+        for id, goal in target.items():
+            if id in positions and abs(positions[id] - goal) <= self.__tolerance:
+                continue
+            if moving is not None and moving.get(id, 1) == 0:
+                continue
+            return False
+        return True
+    
+    def __enter(self, state: HarvestState) -> None:
+        self.__state = state
+        self.__micro_fell = False
+        self.__settled = not self.__targets.get(state)
+        action = self.__actions.get(state)
+        if action is not None:
+            action()
+    
+    def update(self, micro1: int, micro2: int, tdtl: int,
+               positions: Optional[Dict[int, int]] = None, moving: Optional[Dict[int, int]] = None) -> bool:
+        '''
+        센서 샘플(과 pending_ids의 현재 위치/moving 플래그)로 상태를 갱신합니다.
+        상태가 바뀌었으면 True
+        '''
+        micro_low  = micro1 == 0 or micro2 == 0
+        tdtl_rise  = self.__prev_tdtl != 1 and tdtl == 1     # 시작 시 이미 감지 중이면 진입으로 간주
+        micro_fall = self.__prev_micro is False and micro_low
+        self.__prev_tdtl  = tdtl
+        self.__prev_micro = micro_low
+        if micro_fall:
+            self.__micro_fell = True
+        
+        if not self.__settled and positions is not None and self.reached(positions, moving):
+            self.__settled = True
+        
+        state = self.__state
+        if state == HarvestState.HOME:
+            if tdtl_rise:
+                self.__enter(HarvestState.GRASP)
+                # 진입 시 이미 가려져 있으면 하강 에지가 오지 않으므로 통과한 것으로 봄
+                self.__micro_fell = micro_low
+        elif state == HarvestState.GRASP:
+            # 파지 완료 전에 지나간 에지는 아직 감지 중일 때만 인정
+            if self.__settled and self.__micro_fell and micro_low:
+                self.__enter(HarvestState.CUT)
+        elif state == HarvestState.RELEASE:
+            if self.__settled:
+                self.__enter(HarvestState.HOME)
+        return state != self.__state
+    
+    def release(self) -> bool:
+        '''절단이 끝난(CUT, settled) 상태에서만 RELEASE로 넘어갑니다.'''
+        if self.__state != HarvestState.CUT or not self.__settled:
+            return False
+        self.__enter(HarvestState.RELEASE)
+        return True
+    
+    def reset(self) -> None:
+        '''HOME으로 되돌립니다. (동작 명령은 호출하지 않음)'''
+        self.__state      = HarvestState.HOME
+        self.__settled    = True
+        self.__prev_tdtl  = None
+        self.__prev_micro = None
+        self.__micro_fell = False
@@ -0,0 +1,73 @@
+### Imports ###
+import time
+from threading import Thread, Event
+from typing import Any, Callable, Dict, NamedTuple, Optional
+from ._rate import Rate
+
+
+### Class ###
+class Sample(NamedTuple):
+    value: Any
+    stamp: float    # 측정 시각(time.monotonic)
+
+
+class Monitor:
+    '''
+    여러 값을 각자의 주기로 동시에 샘플링하는 모니터
+    샘플러마다 데몬 스레드 하나가 Rate로 주기를 지키며 fn()을 호출하고, 최신 값만 보관합니다.
+    읽는 쪽은 잠금 없이 get()으로 최신 샘플을 가져갑니다.
+    '''
+    def __init__(self):
+        self.__samplers: Dict[str, tuple]       = {}
+        self.__latest: Dict[str, Sample]        = {}
+        self.__errors: Dict[str, BaseException] = {}
+        self.__threads                          = []
+        self.__stopped                          = Event()
+    
+    
+    
+    def add(self, name: str, fn: Callable[[], Any], hz: float) -> 'Monitor':
+        self.__samplers[name] = (fn, hz)
+        return self
+    
+    def __run(self, name: str, fn: Callable[[], Any], hz: float) -> None:
+        rate = Rate(hz)
+        while not self.__stopped.is_set():
+            try:
+                self.__latest[name] = Sample(fn(), time.monotonic())
+            except Exception as e:
+                self.__errors[name] = e
+            rate.sleep()
+    
+    def start(self) -> 'Monitor':
+        self.__stopped.clear()
+        for name, (fn, hz) in self.__samplers.items():
+            thread = Thread(target=self.__run, args=(name, fn, hz), name=f'Monitor-{name}', daemon=True)
+            thread.start()
+            self.__threads.append(thread)
+        return self
+    
+    def stop(self, timeout: float = None) -> None:
+        self.__stopped.set()
+        for thread in self.__threads:
+            thread.join(timeout)
+        self.__threads = []
+    
+    def __enter__(self) -> 'Monitor':
+        return self.start()
+    
+    def __exit__(self, *exc) -> None:
+        self.stop()
+    
+    def get(self, name: str, max_age: float = None) -> Optional[Sample]:
+        '''최신 샘플. 아직 없거나 max_age(s)보다 오래되었으면 None'''
+        sample = self.__latest.get(name)
+        if sample is None:
+            return None
+        if max_age is not None and time.monotonic() - sample.stamp > max_age:
+            return None
+        return sample
+    
+    def error(self, name: str) -> Optional[BaseException]:
+        '''해당 샘플러에서 마지막으로 발생한 예외'''
+        return self.__errors.get(name)
@@ -0,0 +1,52 @@
+### Imports ###
+import time
+
+
+### Class ###
+class Rate:
+    '''
+    고정 주기 루프용 대기
+    sleep()은 다음 주기 시각까지만 잠들며, 처리 시간이 주기를 넘기면(overrun) 잠들지 않고
+    기준 시각을 현재로 다시 잡아 밀린 주기를 몰아서 실행하지 않습니다.
+    '''
+    def __init__(self, hz: float):
+        self.__period   = 1.0 / hz
+        self.__next     = time.monotonic() + self.__period
+        self.overruns   = 0
+    
+    
+    
+    @property
+    def period(self) -> float:
+        return self.__period
+    
+    def sleep(self) -> float:
+        '''남은 시간(s)을 반환. 음수면 그만큼 주기를 넘긴 것'''
+        now = time.monotonic()
+        remaining = self.__next - now
+        if remaining > 0:
+            time.sleep(remaining)
+            self.__next += self.__period
+        else:
+            self.overruns += 1
+            self.__next = now + self.__period
+        return remaining
+    
+    def reset(self) -> None:
+        self.__next = time.monotonic() + self.__period
+
+
+class Deadline:
+    '''timeout(s) 이후 만료되는 시각, None이면 만료되지 않음'''
+    def __init__(self, timeout: float = None):
+        self.__end = None if timeout is None else time.monotonic() + timeout
+    
+    
+    
+    def remaining(self) -> float:
+        if self.__end is None:
+            return float('inf')
+        return max(0.0, self.__end - time.monotonic())
+    
+    def expired(self) -> bool:
+        return self.__end is not None and time.monotonic() >= self.__end
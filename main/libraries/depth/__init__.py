@@ -0,0 +1,12 @@
+'''
+본 프로젝트에서 사용하는 RGB-D 카메라 depth 질의 모듈
+'''
+
+
+
+__all__ = ['Intrinsics', 'DepthImage', 'DepthQuery', 'DepthRefiner']
+
+
+
+from ._query import Intrinsics, DepthImage, DepthQuery
+from ._refine import DepthRefiner
\ No newline at end of file
@@ -0,0 +1,108 @@
+### Imports ###
+from typing import Dict, NamedTuple, Optional, Sequence
+import cv2
+import numpy as np
+
+
+### Class ###
+class Intrinsics(NamedTuple):
+    width: int
+    height: int
+    fx: float
+    fy: float
+    ppx: float
+    ppy: float
+    
+    @classmethod
+    def from_rs(cls, intr) -> 'Intrinsics':
+        '''pyrealsense2.intrinsics에서 필요한 값만 복사'''
+        return cls(intr.width, intr.height, intr.fx, intr.fy, intr.ppx, intr.ppy)
+
+
+class DepthImage(NamedTuple):
+    '''
+    RealSense 없이 z16 배열과 intrinsics로 만든 depth 프레임 (녹화 재생 등)
+    DepthQuery/DepthRefiner에서 pyrealsense2 depth_frame 대신 쓸 수 있습니다.
+    '''
+    data: np.ndarray
+    intrinsics: Intrinsics
+    
+    def get_data(self) -> np.ndarray:
+        return self.data
+
+
+class DepthQuery:
+    '''
+    RealSense depth 프레임 질의
+    z16 버퍼를 복사 없이 numpy로 보고, ROI 안의 유효 픽셀을 한 번에 역투영한 뒤
+    축별 percentile(기본: 중앙값)로 한 점을 구합니다. 구멍(0) 픽셀 하나 때문에 실패하지 않습니다.
+    intrinsics는 stream profile마다 한 번만 SDK에서 읽어 캐시합니다.
+    역투영은 왜곡 계수를 무시한 핀홀 모델입니다. (D400 컬러 스트림/정렬된 depth는 계수가 0)
+    '''
+    def __init__(self, depth_scale: float, percentile: float = 50, min_valid: int = 5):
+        self.depth_scale    = depth_scale   # z16 값 1당 거리(m), depth_sensor.get_depth_scale()
+        self.percentile     = percentile
+        self.min_valid      = min_valid     # ROI 안 유효 픽셀이 이보다 적으면 None
+        self.__intrinsics: Dict[int, Intrinsics] = {}
+    
+    
+    
+    def intrinsics(self, depth_frame) -> Intrinsics:
+        if isinstance(depth_frame, DepthImage):
+            return depth_frame.intrinsics
+        profile = depth_frame.get_profile()
+        key = profile.unique_id()
+        intr = self.__intrinsics.get(key)
+        if intr is None:
+            intr = Intrinsics.from_rs(profile.as_video_stream_profile().get_intrinsics())
+            self.__intrinsics[key] = intr
+        return intr
+    
+    def deproject(self, intr: Intrinsics, u: np.ndarray, v: np.ndarray, z: np.ndarray) -> np.ndarray:
+        '''픽셀 (u, v)와 거리 z(m) 배열 -> (N,3) 카메라 좌표(m)'''
+        x = (np.asarray(u, dtype=float) - intr.ppx) / intr.fx * z
+        y = (np.asarray(v, dtype=float) - intr.ppy) / intr.fy * z
+        return np.stack([x, y, np.asarray(z, dtype=float)], axis=-1)
+    
+    def __reduce(self, depth_frame, x0: int, y0: int, mask: np.ndarray, depth: np.ndarray = None) -> Optional[np.ndarray]:
+        '''(x0, y0)에서 시작하는 mask 영역의 유효 픽셀을 역투영해 한 점으로 요약, depth가 있으면 프레임 버퍼 대신 사용'''
+        intr = self.intrinsics(depth_frame)
+        h, w = mask.shape
+        if depth is None:
+            depth = np.asanyarray(depth_frame.get_data())
+        raw = depth[y0:y0+h, x0:x0+w]
+        vs, us = np.nonzero(mask & (raw > 0))
+        if len(vs) < self.min_valid:
+            return None
+        
+        z = raw[vs, us] * self.depth_scale
+        pts = self.deproject(intr, us + x0, vs + y0, z)
+        return np.percentile(pts, self.percentile, axis=0)
+    
+    def query_point(self, depth_frame, u: float, v: float, radius: int = 3, depth: np.ndarray = None) -> Optional[np.ndarray]:
+        '''
+        (u, v) 주변 (2*radius+1)^2 영역(프레임 안으로 제한)을 역투영해 (X, Y, Z)(m)를 반환, 유효 픽셀이 부족하면 None
+        depth: 후처리한 z16 배열(DepthRefiner.refine), None이면 프레임 버퍼
+        '''
+        intr = self.intrinsics(depth_frame)
+        u = min(max(int(round(u)), 0), intr.width - 1)      # 프레임 밖이면 가장자리로
+        v = min(max(int(round(v)), 0), intr.height - 1)
+        x0, x1 = max(0, u - radius), min(intr.width,  u + radius + 1)
+        y0, y1 = max(0, v - radius), min(intr.height, v + radius + 1)
+        return self.__reduce(depth_frame, x0, y0, np.ones((y1 - y0, x1 - x0), dtype=bool), depth)
+    
+    def query_polygon(self, depth_frame, pts: Sequence, depth: np.ndarray = None) -> Optional[np.ndarray]:
+        '''
+        다각형(예: OBB 꼭짓점 (4,2), depth 픽셀 좌표) 내부를 역투영해 (X, Y, Z)(m)를 반환
+        '''
+        intr = self.intrinsics(depth_frame)
+        pts = np.asarray(pts, dtype=float).reshape(-1, 2)
+        x0, y0 = np.maximum(np.floor(pts.min(axis=0)).astype(int), 0)
+        x1 = min(intr.width,  int(np.ceil(pts[:, 0].max())) + 1)
+        y1 = min(intr.height, int(np.ceil(pts[:, 1].max())) + 1)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        
+        mask = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+        cv2.fillPoly(mask, [np.round(pts - (x0, y0)).astype(np.int32)], 1)
+        return self.__reduce(depth_frame, x0, y0, mask.astype(bool), depth)
@@ -0,0 +1,64 @@
+### Imports ###
+from typing import Iterable, Tuple
+import cv2
+import numpy as np
+
+
+### Class ###
+class DepthRefiner:
+    '''
+    관심 영역(ROI)에만 적용하는 depth 후처리
+    RealSense spatial/hole_filling 필터를 프레임 전체에 거는 대신, 좌표 계산에 쓰일 ROI만 잘라
+      1) 구멍(0) 채우기 : 주변 median으로 채움 (holes회 반복)
+      2) 공간 필터      : 경계 보존 bilateral 필터
+    를 적용합니다. 결과는 미리 할당한 프레임 크기 버퍼에 원본을 복사한 뒤 ROI만 덮어쓴 z16 배열입니다.
+    '''
+    def __init__(self, depth_scale: float, holes: int = 2, spatial_d: int = 5, sigma_m: float = 0.02, sigma_px: float = 3.0):
+        self.depth_scale    = depth_scale
+        self.holes          = holes
+        self.spatial_d      = spatial_d
+        self.sigma_color    = sigma_m / depth_scale     # 거리 차 허용폭(m) -> z16 단위
+        self.sigma_px       = sigma_px
+        self.__out          = None
+    
+    
+    
+    def refine_patch(self, patch: np.ndarray) -> np.ndarray:
+        '''z16 ROI 하나를 후처리한 새 배열'''
+        patch = patch.copy()
+        for _ in range(self.holes):
+            holes = patch == 0
+            if not holes.any():
+                break
+            med = cv2.medianBlur(patch, 5)
+            patch[holes] = med[holes]
+        
+        valid = patch > 0
+        smooth = cv2.bilateralFilter(patch.astype(np.float32), self.spatial_d, self.sigma_color, self.sigma_px)
+        return np.where(valid, smooth, 0).astype(np.uint16)
+    
+    def refine(self, depth: np.ndarray, rois: Iterable[Tuple[int, int, int, int]]) -> np.ndarray:
+        '''
+        depth: (H,W) z16, rois: [(x0, y0, x1, y1), ...] depth 픽셀 좌표
+        return: ROI만 후처리한 (H,W) z16 (다음 호출에서 덮어써지는 버퍼)
+        '''
+        if self.__out is None or self.__out.shape != depth.shape:
+            self.__out = np.empty_like(depth)
+        np.copyto(self.__out, depth)
+        
+        h, w = depth.shape
+        for x0, y0, x1, y1 in rois:
+            x0, y0 = max(0, int(x0)), max(0, int(y0))
+            x1, y1 = min(w, int(x1)), min(h, int(y1))
+            if x1 - x0 < 5 or y1 - y0 < 5:
+                continue
+            self.__out[y0:y1, x0:x1] = self.refine_patch(depth[y0:y1, x0:x1])
+        return self.__out
+    
+    @staticmethod
+    def rois_from_boxes(boxes: np.ndarray, margin: int = 8):
+        '''(N,4,2) OBB 꼭짓점(depth 픽셀) -> 여유(margin)를 둔 축정렬 ROI 리스트'''
+        boxes = np.asarray(boxes, dtype=float).reshape(-1, 4, 2)
+        lo = np.floor(boxes.min(axis=1)).astype(int) - margin
+        hi = np.ceil(boxes.max(axis=1)).astype(int) + margin + 1
+        return [(int(x0), int(y0), int(x1), int(y1)) for (x0, y0), (x1, y1) in zip(lo, hi)]
@@ -0,0 +1,13 @@
+'''
+본 프로젝트에서 사용하는 비전 모델 추론 백엔드 모듈
+PyTorch / ONNX / TensorRT 중 하나를 골라 같은 방식으로 호출합니다
+'''
+
+
+
+__all__ = ['InferenceBackend', 'make_calibration_set']
+
+
+
+from ._backend import InferenceBackend
+from ._calibration import make_calibration_set
\ No newline at end of file
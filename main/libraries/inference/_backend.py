@@ -0,0 +1,166 @@
+### Imports ###
+import hashlib
+import os
+import time
+from typing import Any, Sequence
+import numpy as np
+import torch
+from ultralytics import YOLO
+
+
+### Class ###
+class InferenceBackend:
+    '''
+    YOLO OBB 모델 추론 백엔드
+      'torch'    : .pt 가중치를 PyTorch로 그대로 실행 (기존 방식)
+      'onnx'     : ONNX로 내보낸 뒤 onnxruntime으로 실행 (CPU 테스트 가능)
+      'tensorrt' : TensorRT 엔진으로 내보낸 뒤 실행 (Jetson), precision 'fp16'/'int8' 지원
+    내보낸 파일은 cache_dir(기본: 가중치 폴더/.cache)에 가중치 해시, 백엔드, 정밀도, 입력 크기로
+    이름을 붙여 저장하며, 같은 키의 파일이 있으면 다시 내보내지 않습니다. (가중치를 바꾸면 자동으로 새로 생성)
+    TensorRT 엔진은 GPU 이름/TensorRT 버전, int8은 보정 데이터셋 해시도 키에 포함합니다.
+    int8은 calib_data(make_calibration_set()으로 만든 data.yaml)가 필요합니다.
+    '''
+    BACKENDS    = ('torch', 'onnx', 'tensorrt')
+    PRECISIONS  = ('fp32', 'fp16', 'int8')
+    
+    __FORMAT    = {'onnx': 'onnx', 'tensorrt': 'engine'}
+    
+    
+    def __init__(self,
+                 weights: str,
+                 backend: str = 'torch',
+                 imgsz: int = 320,
+                 precision: str = 'fp32',
+                 calib_data: str = None,
+                 device: Any = None,
+                 cache_dir: str = None):
+        if backend not in self.BACKENDS:
+            raise ValueError(f'unknown backend: {backend}')
+        if precision not in self.PRECISIONS:
+            raise ValueError(f'unknown precision: {precision}')
+        if precision == 'int8' and backend != 'tensorrt':
+            raise ValueError('int8 is only supported with the tensorrt backend')
+        if precision == 'int8' and calib_data is None:
+            raise ValueError('int8 requires calib_data')
+        
+        self.weights    = weights
+        self.backend    = backend
+        self.imgsz      = imgsz
+        self.precision  = precision
+        self.calib_data = calib_data
+        self.device     = device
+        self.cache_dir  = cache_dir or os.path.join(os.path.dirname(weights), '.cache')
+        self.model      = YOLO(self.__prepare(), task='obb')
+        
+        # imgsz x imgsz BGR 프레임을 받을 때 쓰는 입력 텐서 (RGB, CHW, 0~1), 프레임마다 새로 할당하지 않음
+        self.__input    = np.empty((1, 3, imgsz, imgsz), dtype=np.float32)
+        self.__tensor   = torch.from_numpy(self.__input)    # 같은 메모리를 공유
+    
+    
+    
+    @staticmethod
+    def __update(h, path: str) -> None:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+    
+    def __hash(self) -> str:
+        h = hashlib.sha256()
+        self.__update(h, self.weights)
+        return h.hexdigest()[:16]
+    
+    def __calib_hash(self, h) -> None:
+        '''data.yaml과 같은 폴더의 모든 파일(보정 이미지) 경로/내용'''
+        root = os.path.dirname(os.path.abspath(self.calib_data))
+        self.__update(h, self.calib_data)
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                path = os.path.join(dirpath, filename)
+                h.update(os.path.relpath(path, root).encode())
+                self.__update(h, path)
+    
+    def __cuda_index(self) -> int:
+        '''device(None, 0, '0', 'cuda:1', '0,1' 등)에서 첫 CUDA 장치 번호'''
+        if self.device is None:
+            return 0
+        if isinstance(self.device, int):
+            return self.device
+        device = str(self.device).split(',')[0].replace('cuda', '').strip(':')
+        return int(device) if device.isdigit() else 0
+    
+    def __target_hash(self) -> str:
+        '''엔진이 묶이는 실행 환경(GPU, TensorRT 버전)과 int8 보정 데이터셋의 해시, 해당 없으면 빈 문자열'''
+        if self.backend != 'tensorrt':
+            return ''
+        try:
+            import tensorrt
+            trt_version = tensorrt.__version__
+        except ImportError:
+            trt_version = 'unknown'
+        gpu = torch.cuda.get_device_name(self.__cuda_index()) if torch.cuda.is_available() else 'nocuda'
+        
+        h = hashlib.sha256(f'{gpu}|{trt_version}'.encode())
+        if self.precision == 'int8':
+            self.__calib_hash(h)
+        return h.hexdigest()[:8]
+    
+    def cache_path(self) -> str:
+        '''캐시 키(가중치 해시, 백엔드, 정밀도, 입력 크기, TensorRT 실행 환경/보정 데이터)에 해당하는 파일 경로'''
+        stem = os.path.splitext(os.path.basename(self.weights))[0]
+        target = self.__target_hash()
+        name = f'{stem}-{self.__hash()}-{self.backend}-{self.precision}-{self.imgsz}'
+        if target:
+            name += f'-{target}'
+        return os.path.join(self.cache_dir, f'{name}.{self.__FORMAT[self.backend]}')
+    
+    def __prepare(self) -> str:
+        '''백엔드에 맞는 모델 파일 경로, 캐시에 없으면 .pt에서 내보낸 뒤 캐시에 저장'''
+        if self.backend == 'torch':
+            return self.weights
+        
+        path = self.cache_path()
+        if not os.path.exists(path):
+            os.makedirs(self.cache_dir, exist_ok=True)
+            os.replace(self.export(), path)
+        return path
+    
+    def export(self) -> str:
+        '''현재 설정으로 모델을 내보내고 그 경로를 반환 (가중치와 같은 폴더에 생성)'''
+        kwargs = dict(format=self.__FORMAT[self.backend], imgsz=self.imgsz)
+        if self.precision == 'fp16':
+            kwargs['half'] = True
+        elif self.precision == 'int8':
+            kwargs['int8'] = True
+            kwargs['data'] = self.calib_data
+        if self.device is not None:
+            kwargs['device'] = self.device
+        return YOLO(self.weights, task='obb').export(**kwargs)
+    
+    def to_tensor(self, img: np.ndarray) -> torch.Tensor:
+        '''
+        imgsz x imgsz BGR uint8 프레임을 미리 할당한 입력 텐서에 바로 채움 (BGR->RGB, HWC->CHW, /255)
+        ultralytics의 letterbox/stack/transpose 단계를 건너뛰며, 반환 텐서는 다음 호출에서 덮어써집니다.
+        '''
+        np.divide(img[..., ::-1].transpose(2, 0, 1), 255.0, out=self.__input[0])
+        return self.__tensor
+    
+    def predict(self, img, conf: float = 0.7) -> Sequence[Any]:
+        '''YOLO.predict와 같은 결과(Results 리스트)를 반환'''
+        kwargs = dict(conf=conf, imgsz=self.imgsz, verbose=False)
+        if self.device is not None:
+            kwargs['device'] = self.device
+        if isinstance(img, np.ndarray) and img.shape == (self.imgsz, self.imgsz, 3):
+            img = self.to_tensor(img)
+        return self.model.predict(img, **kwargs)
+    
+    def warmup(self, n: int = 3) -> float:
+        '''
+        더미 프레임으로 n번 추론해 지연 초기화(CUDA 컨텍스트, 커널 선택)를 미리 끝냅니다.
+        제어 루프 시작 전에 호출하며, 걸린 시간(s)을 반환합니다.
+        '''
+        start = time.monotonic()
+        dummy = np.zeros((self.imgsz, self.imgsz, 3), dtype=np.uint8)
+        for _ in range(n):
+            self.predict(dummy)
+        return time.monotonic() - start
@@ -0,0 +1,32 @@
+### Imports ###
+import os
+from typing import Iterable, Mapping
+import cv2
+
+
+### Function ###
+def make_calibration_set(frames: Iterable, out_dir: str, names: Mapping[int, str]) -> str:
+    '''
+    녹화한 프레임(BGR ndarray)으로 INT8 보정용 데이터셋을 만들고 data.yaml 경로를 반환합니다.
+    TensorRT INT8 보정은 이미지만 사용하므로 라벨 없이 images/ 폴더만 만듭니다.
+    names: 모델 클래스 이름, 예) YOLO('best.pt').names
+    '''
+    img_dir = os.path.join(out_dir, 'images')
+    os.makedirs(img_dir, exist_ok=True)
+    
+    count = 0
+    for i, frame in enumerate(frames):
+        cv2.imwrite(os.path.join(img_dir, f'{i:06d}.jpg'), frame)
+        count += 1
+    if count == 0:
+        raise ValueError('no frames for calibration')
+    
+    yaml_path = os.path.join(out_dir, 'data.yaml')
+    with open(yaml_path, 'w') as f:
+        f.write(f'path: {os.path.abspath(out_dir)}\n')
+        f.write('train: images\n')
+        f.write('val: images\n')
+        f.write('names:\n')
+        for k in sorted(names):
+            f.write(f'  {k}: {names[k]}\n')
+    return yaml_path
@@ -4,8 +4,11 @@
 
 
 
-__all__ = ['OpenCRSerial']
+__all__ = ['OpenCRSerial', 'AsyncOpenCRSerial', 'SensorSample', 'SensorStream', 'CommandScheduler']
 
 
 
-from ._opencr import OpenCRSerial
\ No newline at end of file
+from ._opencr import OpenCRSerial
+from ._opencr_async import AsyncOpenCRSerial
+from ._stream import SensorSample, SensorStream
+from ._scheduler import CommandScheduler
\ No newline at end of file
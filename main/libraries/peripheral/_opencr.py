@@ -1,12 +1,21 @@
 ### Imports ###
-from typing import Tuple
+import time
+from queue import Queue, Empty
+from threading import Event, Lock, RLock
+from typing import Callable, Dict, List, Sequence, Tuple
 from struct import Struct
 from serial import Serial
 from ..calculate import twoscomp_8, checksum_8
+from ._reader import FrameSplitter, FrameReader
+from ._stream import SensorSample, SensorStream
 
 
 ### Class ###
-class OpenCRSerial:
+class OpenCRProtocol:
+    '''
+    OpenCR 통신 프레임 정의(포맷, 상수, 패킹/검증)
+    전송 방식과 무관하므로 OpenCRSerial과 AsyncOpenCRSerial이 함께 사용합니다.
+    '''
     # exceptions
     class ShortResponseError(Exception):
         '''response 길이가 적절치 않은 에러'''
@@ -16,6 +25,8 @@ class OpenCRSerial:
         '''체크섬 실패 에러'''
     class RetcodeError(Exception):
         '''retcode가 성공(0x00)이 아님'''
+    class ReaderError(Exception):
+        '''수신 reader 스레드가 시리얼 오류로 중단됨'''
     
     
     
@@ -27,11 +38,18 @@ class OpenCRSerial:
     TX_HEADER_SIZE  = DEVADDR_SIZE + FUNCCODE_SIZE
     RX_HEADER_SIZE  = TX_HEADER_SIZE
     RX_TAIL_SIZE    = RETCODE_SIZE + CHECKSUM_SIZE
+    SEQ_SIZE        = 1
+    SEQ_TX_HEADER_SIZE = TX_HEADER_SIZE + SEQ_SIZE  # sequenced 모드: devaddr, funccode, seq
+    SEQ_RX_HEADER_SIZE = SEQ_TX_HEADER_SIZE
     
     ENDIAN          = '<'
     TX_HEADER       = f'{TX_HEADER_SIZE}B'
     RX_HEADER       = f'{RX_HEADER_SIZE}B'
     RX_TAIL         = f'{RX_TAIL_SIZE}B'
+    SEQ_TX_HEADER   = f'{SEQ_TX_HEADER_SIZE}B'
+    SEQ_RX_HEADER   = f'{SEQ_RX_HEADER_SIZE}B'
+    
+    DXL_SYNC_MAX    = 4     # sync 명령 한 프레임에 담을 수 있는 최대 모터 수(고정 길이 프레임)
     
     Param_MicroPhoto_1                = ''
     Param_MicroPhoto_2                = ''
@@ -41,6 +59,13 @@ class OpenCRSerial:
     Param_dxl_goalPosition            = '1B1l'
     Param_dxl_getPresentPositionData  = '1B'
     Param_dxl_init                    = '1B1l1l'
+    Param_Sensors                     = ''
+    Param_SensorStreamStart           = '1H'
+    Param_SensorStreamStop            = ''
+    Param_SensorPush                  = ''
+    Param_dxl_syncGoalPosition        = f'1B{DXL_SYNC_MAX}B{DXL_SYNC_MAX}l'  # count, ids, positions
+    Param_dxl_syncPresentPosition     = f'1B{DXL_SYNC_MAX}B'                 # count, ids
+    Param_dxl_syncMovingStatus        = f'1B{DXL_SYNC_MAX}B'                 # count, ids
     
     Return_MicroPhoto_1               = '1B'
     Return_MicroPhoto_2               = '1B'
@@ -50,6 +75,13 @@ class OpenCRSerial:
     Return_dxl_goalPosition           = ''
     Return_dxl_getPresentPositionData = '1l'
     Return_dxl_init                   = ''
+    Return_Sensors                    = '3B'
+    Return_SensorStreamStart          = ''
+    Return_SensorStreamStop           = ''
+    Return_SensorPush                 = '3B1H'
+    Return_dxl_syncGoalPosition       = ''
+    Return_dxl_syncPresentPosition    = f'{DXL_SYNC_MAX}l'
+    Return_dxl_syncMovingStatus       = f'{DXL_SYNC_MAX}B{DXL_SYNC_MAX}l'    # moving 플래그, 현재 위치
     
     MSGFMT: Tuple[Tuple[Struct, Struct]] = (
         # (packfmt(for transmit)(tail 빼고), unpackfmt(for receive))
@@ -61,6 +93,32 @@ class OpenCRSerial:
         (Struct(f'{ENDIAN}{TX_HEADER}{Param_dxl_goalPosition}')          , Struct(f'{ENDIAN}{RX_HEADER}{Return_dxl_goalPosition}{RX_TAIL}')          ),
         (Struct(f'{ENDIAN}{TX_HEADER}{Param_dxl_getPresentPositionData}'), Struct(f'{ENDIAN}{RX_HEADER}{Return_dxl_getPresentPositionData}{RX_TAIL}')),
         (Struct(f'{ENDIAN}{TX_HEADER}{Param_dxl_init}')                  , Struct(f'{ENDIAN}{RX_HEADER}{Return_dxl_init}{RX_TAIL}')                  ),
+        (Struct(f'{ENDIAN}{TX_HEADER}{Param_Sensors}')                   , Struct(f'{ENDIAN}{RX_HEADER}{Return_Sensors}{RX_TAIL}')                   ),
+        (Struct(f'{ENDIAN}{TX_HEADER}{Param_SensorStreamStart}')         , Struct(f'{ENDIAN}{RX_HEADER}{Return_SensorStreamStart}{RX_TAIL}')         ),
+        (Struct(f'{ENDIAN}{TX_HEADER}{Param_SensorStreamStop}')          , Struct(f'{ENDIAN}{RX_HEADER}{Return_SensorStreamStop}{RX_TAIL}')          ),
+        (Struct(f'{ENDIAN}{TX_HEADER}{Param_SensorPush}')                , Struct(f'{ENDIAN}{RX_HEADER}{Return_SensorPush}{RX_TAIL}')                ),
+        (Struct(f'{ENDIAN}{TX_HEADER}{Param_dxl_syncGoalPosition}')      , Struct(f'{ENDIAN}{RX_HEADER}{Return_dxl_syncGoalPosition}{RX_TAIL}')      ),
+        (Struct(f'{ENDIAN}{TX_HEADER}{Param_dxl_syncPresentPosition}')   , Struct(f'{ENDIAN}{RX_HEADER}{Return_dxl_syncPresentPosition}{RX_TAIL}')   ),
+        (Struct(f'{ENDIAN}{TX_HEADER}{Param_dxl_syncMovingStatus}')      , Struct(f'{ENDIAN}{RX_HEADER}{Return_dxl_syncMovingStatus}{RX_TAIL}')      ),
+    )
+    
+    SEQ_MSGFMT: Tuple[Tuple[Struct, Struct]] = (
+        # MSGFMT와 같은 순서, 헤더에 시퀀스 바이트 추가
+        (Struct(f'{ENDIAN}{SEQ_TX_HEADER}{Param_MicroPhoto_1}')              , Struct(f'{ENDIAN}{SEQ_RX_HEADER}{Return_MicroPhoto_1}{RX_TAIL}')              ),
+        (Struct(f'{ENDIAN}{SEQ_TX_HEADER}{Param_MicroPhoto_2}')              , Struct(f'{ENDIAN}{SEQ_RX_HEADER}{Return_MicroPhoto_2}{RX_TAIL}')              ),
+        (Struct(f'{ENDIAN}{SEQ_TX_HEADER}{Param_TDTL}')                      , Struct(f'{ENDIAN}{SEQ_RX_HEADER}{Return_TDTL}{RX_TAIL}')                      ),
+        (Struct(f'{ENDIAN}{SEQ_TX_HEADER}{Param_dxl_torqueOn}')              , Struct(f'{ENDIAN}{SEQ_RX_HEADER}{Return_dxl_torqueOn}{RX_TAIL}')              ),
+        (Struct(f'{ENDIAN}{SEQ_TX_HEADER}{Param_dxl_torqueOff}')             , Struct(f'{ENDIAN}{SEQ_RX_HEADER}{Return_dxl_torqueOff}{RX_TAIL}')             ),
+        (Struct(f'{ENDIAN}{SEQ_TX_HEADER}{Param_dxl_goalPosition}')          , Struct(f'{ENDIAN}{SEQ_RX_HEADER}{Return_dxl_goalPosition}{RX_TAIL}')          ),
+        (Struct(f'{ENDIAN}{SEQ_TX_HEADER}{Param_dxl_getPresentPositionData}'), Struct(f'{ENDIAN}{SEQ_RX_HEADER}{Return_dxl_getPresentPositionData}{RX_TAIL}')),
+        (Struct(f'{ENDIAN}{SEQ_TX_HEADER}{Param_dxl_init}')                  , Struct(f'{ENDIAN}{SEQ_RX_HEADER}{Return_dxl_init}{RX_TAIL}')                  ),
+        (Struct(f'{ENDIAN}{SEQ_TX_HEADER}{Param_Sensors}')                   , Struct(f'{ENDIAN}{SEQ_RX_HEADER}{Return_Sensors}{RX_TAIL}')                   ),
+        (Struct(f'{ENDIAN}{SEQ_TX_HEADER}{Param_SensorStreamStart}')         , Struct(f'{ENDIAN}{SEQ_RX_HEADER}{Return_SensorStreamStart}{RX_TAIL}')         ),
+        (Struct(f'{ENDIAN}{SEQ_TX_HEADER}{Param_SensorStreamStop}')          , Struct(f'{ENDIAN}{SEQ_RX_HEADER}{Return_SensorStreamStop}{RX_TAIL}')          ),
+        (Struct(f'{ENDIAN}{SEQ_TX_HEADER}{Param_SensorPush}')                , Struct(f'{ENDIAN}{SEQ_RX_HEADER}{Return_SensorPush}{RX_TAIL}')                ),
+        (Struct(f'{ENDIAN}{SEQ_TX_HEADER}{Param_dxl_syncGoalPosition}')      , Struct(f'{ENDIAN}{SEQ_RX_HEADER}{Return_dxl_syncGoalPosition}{RX_TAIL}')      ),
+        (Struct(f'{ENDIAN}{SEQ_TX_HEADER}{Param_dxl_syncPresentPosition}')   , Struct(f'{ENDIAN}{SEQ_RX_HEADER}{Return_dxl_syncPresentPosition}{RX_TAIL}')   ),
+        (Struct(f'{ENDIAN}{SEQ_TX_HEADER}{Param_dxl_syncMovingStatus}')      , Struct(f'{ENDIAN}{SEQ_RX_HEADER}{Return_dxl_syncMovingStatus}{RX_TAIL}')      ),
     )
     
     # constants
@@ -73,6 +131,13 @@ class OpenCRSerial:
     VALUE_FUNCCODE_dxl_goalPosition           = 0x05
     VALUE_FUNCCODE_dxl_getPresentPositionData = 0x06
     VALUE_FUNCCODE_dxl_init                   = 0x07
+    VALUE_FUNCCODE_sensors                    = 0x08
+    VALUE_FUNCCODE_sensorStreamStart          = 0x09
+    VALUE_FUNCCODE_sensorStreamStop           = 0x0A
+    VALUE_FUNCCODE_sensorPush                 = 0x0B  # OpenCR -> PC 단방향 프레임
+    VALUE_FUNCCODE_dxl_syncGoalPosition       = 0x0C
+    VALUE_FUNCCODE_dxl_syncPresentPosition    = 0x0D
+    VALUE_FUNCCODE_dxl_syncMovingStatus       = 0x0E
     
     VALUE_RETCODE_CALLBACK_SUCCESS = 0x00
     VALUE_RETCODE_CALLBACK_FAIL    = 0x01
@@ -83,38 +148,231 @@ class OpenCRSerial:
     VALUE_ACCADC_RESOLUTION = 8.0/32768.0
     
     
-    def __init__(self, port: str, baudrate: int, timeout: float, devaddr: int):
+    @classmethod
+    def msgfmt(cls, sequenced: bool) -> Tuple[Tuple[Struct, Struct]]:
+        return cls.SEQ_MSGFMT if sequenced else cls.MSGFMT
+    
+    @classmethod
+    def header_size(cls, sequenced: bool) -> int:
+        return cls.SEQ_TX_HEADER_SIZE if sequenced else cls.TX_HEADER_SIZE
+    
+    @classmethod
+    def pack_frame(cls, sequenced: bool, devaddr, funccode, *data, seq: int = None) -> bytes:
+        txfmt: Struct = cls.msgfmt(sequenced)[funccode][0]
+        
+        payload = [devaddr, funccode, *data] if seq is None else [devaddr, funccode, seq, *data]
+        payload = txfmt.pack(*payload)
+        payload += twoscomp_8(checksum_8(payload)).to_bytes(1, 'little')
+        return payload
+    
+    @classmethod
+    def unpack_frame(cls, sequenced: bool, funccode, payload: bytes, response: bytes) -> tuple:
+        '''payload(요청)에 대한 response(응답)를 검증하고 반환값 튜플을 돌려줍니다.'''
+        rxfmt: Struct = cls.msgfmt(sequenced)[funccode][1]
+        header_size = cls.header_size(sequenced)
+        
+        if len(response) != rxfmt.size:
+            raise cls.ShortResponseError(f'response: 0x {response.hex(" ")}')
+        if checksum_8(response) != 0:
+            raise cls.CheckSumError(f'response: 0x {response.hex(" ")}')
+        if payload[:header_size] != response[:header_size]:
+            raise cls.ResponseHeaderError(f'response: 0x {response.hex(" ")}')
+        if int.from_bytes(response[-cls.RX_TAIL_SIZE: -cls.CHECKSUM_SIZE], 'little') != cls.VALUE_RETCODE_CALLBACK_SUCCESS:
+            raise cls.RetcodeError(f'response: 0x {response.hex(" ")}')
+        
+        return rxfmt.unpack(response)[header_size: -cls.RX_TAIL_SIZE]
+    
+    @classmethod
+    def unpack_push(cls, sequenced: bool, frame: bytes) -> tuple:
+        '''sensorPush 프레임의 값 튜플, retcode가 실패면 None'''
+        if int.from_bytes(frame[-cls.RX_TAIL_SIZE: -cls.CHECKSUM_SIZE], 'little') != cls.VALUE_RETCODE_CALLBACK_SUCCESS:
+            return None
+        
+        rxfmt: Struct = cls.msgfmt(sequenced)[cls.VALUE_FUNCCODE_sensorPush][1]
+        return rxfmt.unpack(frame)[cls.header_size(sequenced): -cls.RX_TAIL_SIZE]
+    
+    @classmethod
+    def sync_params(cls, ids: Sequence[int], values: Sequence[int] = None) -> list:
+        '''sync 명령 파라미터(count, ids[DXL_SYNC_MAX], values[DXL_SYNC_MAX])를 0으로 채워 만듭니다.'''
+        if len(ids) > cls.DXL_SYNC_MAX:
+            raise ValueError(f'at most {cls.DXL_SYNC_MAX} motors per sync command')
+        
+        pad = [0] * (cls.DXL_SYNC_MAX - len(ids))
+        params = [len(ids), *ids, *pad]
+        if values is not None:
+            params += [*values, *pad]
+        return params
+    
+    @classmethod
+    def frame_splitter(cls, sequenced: bool, devaddr: int) -> FrameSplitter:
+        rxsizes = [rxfmt.size for _, rxfmt in cls.msgfmt(sequenced)]
+        return FrameSplitter(devaddr, rxsizes, cls.DEVADDR_SIZE)
+
+
+class OpenCRSerial(OpenCRProtocol):
+    def __init__(self, port: str, baudrate: int, timeout: float, devaddr: int, sequenced: bool = False):
+        '''
+        sequenced=True 이면 헤더에 시퀀스 바이트를 추가한 프로토콜을 사용합니다.
+        이 모드에서는 reader 스레드가 항상 수신을 전담하고, 응답을 시퀀스 번호로 요청과 짝지으므로
+        send()로 여러 명령을 응답을 기다리지 않고 연달아 보낼 수 있습니다.
+        '''
         self.__serial           = Serial(port, baudrate, 8, 'N', 1, timeout=timeout, write_timeout=timeout)
         self.__devaddr          = devaddr
+        self.__timeout          = timeout
+        self.__sequenced        = sequenced
+        self.__msgfmt           = self.msgfmt(sequenced)
+        
+        # 스트리밍/시퀀스 모드에서는 reader 스레드가 수신을 전담하고, 응답 프레임은 큐(또는 시퀀스 표)로 전달
+        self.__reader: FrameReader   = None
+        self.__stream: SensorStream  = None
+        self.__responses: Queue      = Queue()
+        
+        # __lock: 시퀀스 번호/대기 표 보호, __io_lock: stop-and-wait 송수신과 reader 수명 보호
+        # 여러 스레드가 같은 인스턴스를 공유해도 프레임이 섞이지 않습니다
+        self.__lock                                     = Lock()
+        self.__io_lock                                  = RLock()
+        self.__seq                                      = 0
+        self.__pending: Dict[int, 'OpenCRSerial.Pending'] = {}
+        
+        if sequenced:
+            self.__open_reader()
     
     
     
-    def __communicate(self, devaddr, funccode, *data) -> tuple:
-        txfmt: Struct = self.MSGFMT[funccode][0]
-        rxfmt: Struct = self.MSGFMT[funccode][1]
+    class Pending:
+        '''sequenced 모드에서 응답을 기다리는 요청'''
+        def __init__(self, unpack: Callable[[bytes], tuple], cancel: Callable[[], None], timeout: float):
+            self.__unpack   = unpack
+            self.__cancel   = cancel
+            self.__timeout  = timeout
+            self.__event    = Event()
+            self.__response = b''
+            self.__error    = None
         
-        payload = [devaddr, funccode, *data]
-        payload = txfmt.pack(*payload)
-        payload += twoscomp_8(checksum_8(payload)).to_bytes(1, 'little')
+        def _resolve(self, response: bytes) -> None:
+            self.__response = response
+            self.__event.set()
         
-        self.__serial.reset_input_buffer()
-        self.__serial.reset_output_buffer()
-        self.__serial.write(payload)
-        # print(f'write: 0x {payload.hex(" ")}')
+        def _fail(self, error: Exception) -> None:
+            self.__error = error
+            self.__event.set()
         
-        response = self.__serial.read(rxfmt.size)
-        # print(f'read : 0x {response.hex(" ")}')
+        def done(self) -> bool:
+            return self.__event.is_set()
         
-        if len(response) != rxfmt.size:
-            raise self.ShortResponseError(f'response: 0x {response.hex(" ")}')
-        if checksum_8(response) != 0:
-            raise self.CheckSumError(f'response: 0x {response.hex(" ")}')
-        if payload[:self.TX_HEADER_SIZE] != response[:self.RX_HEADER_SIZE]:
-            raise self.ResponseHeaderError(f'response: 0x {response.hex(" ")}')
-        if int.from_bytes(response[-self.RX_TAIL_SIZE: -self.CHECKSUM_SIZE], 'little') != self.VALUE_RETCODE_CALLBACK_SUCCESS:
-            raise self.RetcodeError(f'response: 0x {response.hex(" ")}')
+        def result(self, timeout: float = None) -> tuple:
+            '''응답을 기다려 반환값을 돌려줍니다. 응답이 없거나 잘못되면 해당 예외를 발생시킵니다.'''
+            if not self.__event.wait(self.__timeout if timeout is None else timeout):
+                self.__cancel()
+            if self.__error is not None:
+                raise self.__error
+            return self.__unpack(self.__response)
+    
+    
+    
+    def __pack(self, devaddr, funccode, *data, seq: int = None) -> bytes:
+        return self.pack_frame(self.__sequenced, devaddr, funccode, *data, seq=seq)
+    
+    def __unpack(self, funccode, payload: bytes, response: bytes) -> tuple:
+        return self.unpack_frame(self.__sequenced, funccode, payload, response)
+    
+    def __exchange(self, payload: bytes, rxsize: int) -> bytes:
+        '''stop-and-wait 송수신. 응답 바이트열을 그대로 반환'''
+        with self.__io_lock:
+            if self.__reader is None:
+                self.__serial.reset_input_buffer()
+                self.__serial.reset_output_buffer()
+                self.__serial.write(payload)
+                # print(f'write: 0x {payload.hex(" ")}')
+            
+                response = self.__serial.read(rxsize)
+                # print(f'read : 0x {response.hex(" ")}')
+            else:
+                self.__check_reader()
+                # 입력 버퍼에는 push 프레임이 섞여 있으므로 버리지 않고, 이전의 늦은 응답만 비움
+                while not self.__responses.empty():
+                    self.__responses.get_nowait()
+                self.__serial.reset_output_buffer()
+                self.__serial.write(payload)
+            
+                try:
+                    response = self.__responses.get(timeout=self.__timeout)
+                except Empty:
+                    response = b''
+                self.__check_reader()
+            return response
+    
+    def __communicate(self, devaddr, funccode, *data) -> tuple:
+        if self.__sequenced:
+            return self.__send(devaddr, funccode, *data).result()
         
-        return rxfmt.unpack(response)[self.RX_HEADER_SIZE: -self.RX_TAIL_SIZE]
+        payload = self.__pack(devaddr, funccode, *data)
+        response = self.__exchange(payload, self.__msgfmt[funccode][1].size)
+        return self.__unpack(funccode, payload, response)
+    
+    def __send(self, devaddr, funccode, *data) -> 'OpenCRSerial.Pending':
+        self.__check_reader()
+        with self.__lock:
+            # 0은 push 프레임용으로 남겨두고 1~255 중 사용 중이 아닌 번호를 할당
+            for _ in range(255):
+                self.__seq = self.__seq % 255 + 1
+                if self.__seq not in self.__pending:
+                    break
+            else:
+                raise RuntimeError('no free sequence number: too many requests in flight')
+            seq = self.__seq
+            
+            payload = self.__pack(devaddr, funccode, *data, seq=seq)
+            pending = self.Pending(
+                lambda response: self.__unpack(funccode, payload, response),
+                lambda: self.__cancel(seq),
+                self.__timeout,
+            )
+            self.__pending[seq] = pending
+            self.__serial.write(payload)
+        return pending
+    
+    def __cancel(self, seq: int) -> None:
+        with self.__lock:
+            self.__pending.pop(seq, None)
+    
+    def send(self, funccode: int, *data) -> 'OpenCRSerial.Pending':
+        '''
+        응답을 기다리지 않고 명령을 전송하고 Pending을 반환합니다.
+        sequenced 모드가 아니면 기존처럼 응답까지 받은 뒤 완료된 Pending을 반환합니다.
+        예) p11 = oc.send(oc.VALUE_FUNCCODE_dxl_goalPosition, 11, 2048)
+            p13 = oc.send(oc.VALUE_FUNCCODE_dxl_goalPosition, 13, 2500)
+            p11.result(); p13.result()
+        '''
+        if self.__sequenced:
+            return self.__send(self.__devaddr, funccode, *data)
+        
+        payload = self.__pack(self.__devaddr, funccode, *data)
+        response = self.__exchange(payload, self.__msgfmt[funccode][1].size)
+        pending = self.Pending(lambda response: self.__unpack(funccode, payload, response), lambda: None, self.__timeout)
+        pending._resolve(response)
+        return pending
+
+    def __on_frame(self, frame: bytes) -> None:
+        '''reader 스레드에서 호출. push 프레임은 스트림에, 나머지는 응답 큐(또는 시퀀스 표)에 전달'''
+        funccode = frame[self.DEVADDR_SIZE]
+        if funccode != self.VALUE_FUNCCODE_sensorPush:
+            if not self.__sequenced:
+                self.__responses.put(frame)
+                return
+            
+            with self.__lock:
+                pending = self.__pending.pop(frame[self.TX_HEADER_SIZE], None)
+            if pending is not None:
+                pending._resolve(frame)
+            return
+        
+        stream = self.__stream
+        if stream is None:
+            return
+        values = self.unpack_push(self.__sequenced, frame)
+        if values is not None:
+            stream.push(SensorSample(*values, time.monotonic()))
 
     def microphoto_1(self) -> None:
         return self.__communicate(self.__devaddr, self.VALUE_FUNCCODE_microphoto_1)
@@ -142,4 +400,98 @@ class OpenCRSerial:
         '''
         해당 메서드로 초기화에 성공하지 않은 id의 다이나믹셀을 조작할 경우 실패할 수 있습니다.
         '''
-        return self.__communicate(self.__devaddr, self.VALUE_FUNCCODE_dxl_init, id, velocity, acceleration)
\ No newline at end of file
+        return self.__communicate(self.__devaddr, self.VALUE_FUNCCODE_dxl_init, id, velocity, acceleration)
+
+    def sensors(self) -> Tuple[int, int, int]:
+        '''
+        마이크로 포토센서 1, 2와 TDTL 값을 한 번의 요청으로 읽습니다.
+        반환: (microphoto_1, microphoto_2, tdtl)
+        '''
+        return self.__communicate(self.__devaddr, self.VALUE_FUNCCODE_sensors)
+
+    def dxl_syncGoalPosition(self, targets: Sequence[Tuple[int, int]]) -> None:
+        '''
+        여러 다이나믹셀의 목표 위치를 한 프레임으로 전송합니다.
+        targets: [(id, position), ...] (최대 DXL_SYNC_MAX개)
+        '''
+        ids = [id for id, _ in targets]
+        values = [value for _, value in targets]
+        return self.__communicate(self.__devaddr, self.VALUE_FUNCCODE_dxl_syncGoalPosition, *self.sync_params(ids, values))
+
+    def dxl_syncPresentPosition(self, ids: Sequence[int]) -> List[int]:
+        '''dxl_getPresentPositionData의 다중 모터 버전. 한 프레임으로 읽어 ids와 같은 순서로 반환'''
+        ret = self.__communicate(self.__devaddr, self.VALUE_FUNCCODE_dxl_syncPresentPosition, *self.sync_params(ids))
+        return list(ret[:len(ids)])
+
+    def dxl_syncMovingStatus(self, ids: Sequence[int]) -> List[Tuple[int, int]]:
+        '''
+        여러 다이나믹셀의 (moving, 현재 위치)를 한 프레임으로 읽습니다.
+        moving은 다이나믹셀의 Moving 레지스터 값으로, 목표 위치로 이동 중이면 1입니다.
+        '''
+        ret = self.__communicate(self.__devaddr, self.VALUE_FUNCCODE_dxl_syncMovingStatus, *self.sync_params(ids))
+        n = self.DXL_SYNC_MAX
+        return list(zip(ret[:len(ids)], ret[n:n + len(ids)]))
+
+    @property
+    def stream(self) -> SensorStream:
+        '''스트리밍 중이면 SensorStream, 아니면 None'''
+        return self.__stream
+
+    def stream_start(self, period_ms: int = 10, history: int = 256) -> SensorStream:
+        '''
+        OpenCR이 period_ms 주기로 센서 값을 push 하도록 요청하고, 수신 전담 reader 스레드를 시작합니다.
+        스트리밍 중에도 다른 명령은 그대로 사용할 수 있습니다.
+        '''
+        with self.__io_lock:
+            if self.__stream is not None:
+                self.stream_stop()
+        
+            self.__stream = SensorStream(history)
+            started = self.__reader is None
+            if started:
+                self.__open_reader()
+        
+            try:
+                self.__communicate(self.__devaddr, self.VALUE_FUNCCODE_sensorStreamStart, period_ms)
+            except Exception:
+                self.__stream = None
+                if started:
+                    self.__close_reader()
+                raise
+            return self.__stream
+
+    def stream_stop(self) -> None:
+        with self.__io_lock:
+            if self.__stream is None:
+                return
+            try:
+                self.__communicate(self.__devaddr, self.VALUE_FUNCCODE_sensorStreamStop)
+            finally:
+                self.__stream = None
+                if not self.__sequenced:
+                    self.__close_reader()
+
+    def __check_reader(self) -> None:
+        '''reader가 중단되었으면 응답을 기다리지 않고 바로 실패'''
+        reader = self.__reader
+        if reader is not None and reader.error is not None:
+            raise self.ReaderError(repr(reader.error))
+    
+    def __on_reader_error(self, error: Exception) -> None:
+        '''reader 스레드에서 호출. 응답을 기다리는 모든 요청을 즉시 실패시킴'''
+        with self.__lock:
+            pendings = list(self.__pending.values())
+            self.__pending.clear()
+        for pending in pendings:
+            pending._fail(self.ReaderError(repr(error)))
+        self.__responses.put(b'')       # stop-and-wait 대기도 깨움
+    
+    def __open_reader(self) -> None:
+        splitter = self.frame_splitter(self.__sequenced, self.__devaddr)
+        self.__reader = FrameReader(self.__serial, splitter, self.__on_frame, self.__on_reader_error)
+        self.__serial.reset_input_buffer()
+        self.__reader.start()
+
+    def __close_reader(self) -> None:
+        self.__reader.stop()
+        self.__reader = None
\ No newline at end of file
@@ -0,0 +1,192 @@
+### Imports ###
+import asyncio
+import time
+from typing import Dict, List, Sequence, Tuple
+from serial import Serial
+from ._opencr import OpenCRProtocol
+from ._stream import SensorSample, SensorStream
+
+
+### Class ###
+class AsyncOpenCRSerial(OpenCRProtocol):
+    '''
+    OpenCRSerial의 asyncio 버전
+    포트를 non-blocking으로 열고 이벤트 루프의 reader 콜백으로 수신하므로, 응답을 기다리는 동안
+    카메라/로봇 상태 등 다른 코루틴이 멈추지 않습니다. (POSIX 전용: loop.add_reader 사용)
+    
+    예)
+        async with AsyncOpenCRSerial('/dev/ttyACM0', 57600, 1.0, 0xf0) as oc:
+            tdtl = (await oc.tdtl())[0]
+            await oc.dxl_goalPosition(11, 2048)
+    '''
+    def __init__(self, port: str, baudrate: int, timeout: float, devaddr: int, sequenced: bool = False):
+        '''
+        sequenced=True 이면 응답을 시퀀스 번호로 짝지으므로 여러 코루틴이 동시에 명령을 보낼 수 있습니다.
+        아니면 한 번에 하나의 요청만 전송합니다.
+        '''
+        self.__serial           = Serial(port, baudrate, 8, 'N', 1, timeout=0, write_timeout=timeout)
+        self.__devaddr          = devaddr
+        self.__timeout          = timeout
+        self.__sequenced        = sequenced
+        self.__splitter         = self.frame_splitter(sequenced, devaddr)
+        
+        self.__loop: asyncio.AbstractEventLoop      = None
+        self.__stream: SensorStream                 = None
+        self.__lock: asyncio.Lock                   = None
+        self.__waiter: asyncio.Future               = None  # stop-and-wait 모드의 응답 대기
+        self.__seq                                  = 0
+        self.__pending: Dict[int, asyncio.Future]   = {}
+    
+    
+    
+    async def __aenter__(self) -> 'AsyncOpenCRSerial':
+        await self.open()
+        return self
+    
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+    
+    async def open(self) -> None:
+        '''현재 이벤트 루프에 수신 콜백을 등록합니다. 첫 요청 시 자동으로 호출됩니다.'''
+        if self.__loop is not None:
+            return
+        self.__loop = asyncio.get_running_loop()
+        self.__lock = asyncio.Lock()
+        self.__serial.reset_input_buffer()
+        self.__loop.add_reader(self.__serial.fileno(), self.__on_readable)
+    
+    async def close(self) -> None:
+        if self.__loop is not None:
+            if self.__stream is not None:
+                await self.stream_stop()
+            self.__loop.remove_reader(self.__serial.fileno())
+            self.__loop = None
+        self.__serial.close()
+    
+    
+    
+    def __on_readable(self) -> None:
+        data = self.__serial.read(self.__serial.in_waiting or 1)
+        for frame in self.__splitter.feed(data):
+            self.__on_frame(frame)
+    
+    def __on_frame(self, frame: bytes) -> None:
+        funccode = frame[self.DEVADDR_SIZE]
+        if funccode == self.VALUE_FUNCCODE_sensorPush:
+            values = self.unpack_push(self.__sequenced, frame) if self.__stream is not None else None
+            if values is not None:
+                self.__stream.push(SensorSample(*values, time.monotonic()))
+            return
+        
+        if self.__sequenced:
+            waiter = self.__pending.pop(frame[self.TX_HEADER_SIZE], None)
+        else:
+            waiter, self.__waiter = self.__waiter, None
+        if waiter is not None and not waiter.done():
+            waiter.set_result(frame)
+    
+    async def __wait(self, waiter: asyncio.Future) -> bytes:
+        try:
+            return await asyncio.wait_for(waiter, self.__timeout)
+        except asyncio.TimeoutError:
+            return b''
+    
+    async def __communicate(self, funccode, *data) -> tuple:
+        await self.open()
+        
+        if self.__sequenced:
+            # 0은 push 프레임용으로 남겨두고 1~255 중 사용 중이 아닌 번호를 할당
+            for _ in range(255):
+                self.__seq = self.__seq % 255 + 1
+                if self.__seq not in self.__pending:
+                    break
+            else:
+                raise RuntimeError('no free sequence number: too many requests in flight')
+            seq = self.__seq
+            
+            payload = self.pack_frame(True, self.__devaddr, funccode, *data, seq=seq)
+            waiter = self.__loop.create_future()
+            self.__pending[seq] = waiter
+            self.__serial.write(payload)
+            try:
+                response = await self.__wait(waiter)
+            finally:
+                self.__pending.pop(seq, None)
+        else:
+            async with self.__lock:
+                payload = self.pack_frame(False, self.__devaddr, funccode, *data)
+                self.__waiter = self.__loop.create_future()
+                self.__serial.write(payload)
+                try:
+                    response = await self.__wait(self.__waiter)
+                finally:
+                    self.__waiter = None
+        
+        return self.unpack_frame(self.__sequenced, funccode, payload, response)
+    
+    async def send(self, funccode: int, *data) -> tuple:
+        return await self.__communicate(funccode, *data)
+
+    async def microphoto_1(self) -> Tuple[int]:
+        return await self.__communicate(self.VALUE_FUNCCODE_microphoto_1)
+    
+    async def microphoto_2(self) -> Tuple[int]:
+        return await self.__communicate(self.VALUE_FUNCCODE_microphoto_2)
+
+    async def tdtl(self) -> Tuple[int]:
+        return await self.__communicate(self.VALUE_FUNCCODE_tdtl)
+
+    async def sensors(self) -> Tuple[int, int, int]:
+        return await self.__communicate(self.VALUE_FUNCCODE_sensors)
+
+    async def dxl_torqueOn(self, id: int) -> None:
+        return await self.__communicate(self.VALUE_FUNCCODE_dxl_torqueOn, id)
+    
+    async def dxl_torqueOff(self, id: int) -> None:
+        return await self.__communicate(self.VALUE_FUNCCODE_dxl_torqueOff, id)
+        
+    async def dxl_goalPosition(self, id: int, value: int) -> None:
+        return await self.__communicate(self.VALUE_FUNCCODE_dxl_goalPosition, id, value)
+        
+    async def dxl_getPresentPositionData(self, id: int) -> int:
+        ret = await self.__communicate(self.VALUE_FUNCCODE_dxl_getPresentPositionData, id)
+        return ret[0]
+    
+    async def dxl_init(self, id: int, velocity: int, acceleration: int):
+        return await self.__communicate(self.VALUE_FUNCCODE_dxl_init, id, velocity, acceleration)
+
+    async def dxl_syncGoalPosition(self, targets: Sequence[Tuple[int, int]]) -> None:
+        ids = [id for id, _ in targets]
+        values = [value for _, value in targets]
+        return await self.__communicate(self.VALUE_FUNCCODE_dxl_syncGoalPosition, *self.sync_params(ids, values))
+
+    async def dxl_syncPresentPosition(self, ids: Sequence[int]) -> List[int]:
+        ret = await self.__communicate(self.VALUE_FUNCCODE_dxl_syncPresentPosition, *self.sync_params(ids))
+        return list(ret[:len(ids)])
+
+    async def dxl_syncMovingStatus(self, ids: Sequence[int]) -> List[Tuple[int, int]]:
+        ret = await self.__communicate(self.VALUE_FUNCCODE_dxl_syncMovingStatus, *self.sync_params(ids))
+        n = self.DXL_SYNC_MAX
+        return list(zip(ret[:len(ids)], ret[n:n + len(ids)]))
+
+    @property
+    def stream(self) -> SensorStream:
+        return self.__stream
+
+    async def stream_start(self, period_ms: int = 10, history: int = 256) -> SensorStream:
+        '''OpenCRSerial.stream_start와 같으며, push 샘플은 이벤트 루프에서 SensorStream에 저장됩니다.'''
+        self.__stream = SensorStream(history)
+        try:
+            await self.__communicate(self.VALUE_FUNCCODE_sensorStreamStart, period_ms)
+        except Exception:
+            self.__stream = None
+            raise
+        return self.__stream
+
+    async def stream_stop(self) -> None:
+        if self.__stream is None:
+            return
+        try:
+            await self.__communicate(self.VALUE_FUNCCODE_sensorStreamStop)
+        finally:
+            self.__stream = None
@@ -0,0 +1,97 @@
+### Imports ###
+from threading import Thread, Event
+from typing import Callable, List, Optional, Sequence
+from serial import Serial
+from ..calculate import checksum_8
+
+
+### Class ###
+class FrameSplitter:
+    '''
+    수신 바이트열을 OpenCR 응답 프레임 단위로 잘라내는 클래스
+    프레임 길이는 funccode 별 수신 포맷 크기(rxsizes)로 결정하며, 체크섬이 맞지 않으면 1바이트씩 밀어 재동기화합니다.
+    '''
+    def __init__(self, devaddr: int, rxsizes: Sequence[int], funccode_offset: int):
+        self.__devaddr          = devaddr
+        self.__rxsizes          = list(rxsizes)
+        self.__funccode_offset  = funccode_offset
+        self.__buffer           = bytearray()
+    
+    
+    
+    def feed(self, data: bytes) -> List[bytes]:
+        buf = self.__buffer
+        buf += data
+        
+        frames = []
+        while len(buf) > self.__funccode_offset:
+            if buf[0] != self.__devaddr:
+                del buf[0]
+                continue
+            
+            funccode = buf[self.__funccode_offset]
+            if funccode >= len(self.__rxsizes):
+                del buf[0]
+                continue
+            
+            size = self.__rxsizes[funccode]
+            if len(buf) < size:
+                break
+            
+            frame = bytes(buf[:size])
+            if checksum_8(frame) != 0:
+                del buf[0]
+                continue
+            
+            frames.append(frame)
+            del buf[:size]
+        return frames
+    
+    def clear(self) -> None:
+        self.__buffer.clear()
+
+
+class FrameReader(Thread):
+    '''
+    시리얼 수신을 전담하는 데몬 스레드
+    잘라낸 프레임마다 on_frame(frame)을 reader 스레드에서 호출합니다.
+    시리얼 오류가 나면 error에 기록하고 on_error(error)를 호출한 뒤 종료합니다. (조용히 죽지 않음)
+    '''
+    def __init__(self,
+                 serial: Serial,
+                 splitter: FrameSplitter,
+                 on_frame: Callable[[bytes], None],
+                 on_error: Optional[Callable[[Exception], None]] = None):
+        super().__init__(name='OpenCRFrameReader', daemon=True)
+        self.__serial   = serial
+        self.__splitter = splitter
+        self.__on_frame = on_frame
+        self.__on_error = on_error
+        self.__stopped  = Event()
+        
+        self.error: Optional[Exception] = None     # 수신을 중단시킨 예외
+    
+    
+    
+    def run(self) -> None:
+        while not self.__stopped.is_set():
+            try:
+                data = self.__serial.read(self.__serial.in_waiting or 1)
+            except Exception as e:
+                if self.__stopped.is_set():
+                    break
+                self.error = e
+                print(f'[{self.name}] {e!r}')
+                if self.__on_error is not None:
+                    self.__on_error(e)
+                break
+            if not data:
+                continue
+            
+            for frame in self.__splitter.feed(data):
+                self.__on_frame(frame)
+    
+    def stop(self, timeout: float = None) -> None:
+        self.__stopped.set()
+        if self.is_alive():
+            self.join(timeout)
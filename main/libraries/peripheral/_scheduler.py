@@ -0,0 +1,65 @@
+### Imports ###
+import itertools
+from concurrent.futures import Future
+from queue import PriorityQueue
+from threading import Thread
+from typing import Any, Callable
+
+
+### Class ###
+class CommandScheduler:
+    '''
+    OpenCRSerial 명령을 우선순위 큐에 넣고 하나의 작업 스레드에서 순서대로 실행하는 스케줄러
+    여러 스레드(센서 모니터링, 동작 명령)가 같은 포트를 쓰더라도 프레임이 섞이지 않으며,
+    우선순위 값이 작은 명령이 대기 중인 센서 폴링보다 먼저 실행됩니다.
+    같은 우선순위끼리는 제출 순서를 따릅니다.
+    '''
+    PRIORITY_URGENT = 0     # 정지, 파지, 절단
+    PRIORITY_MOTION = 1     # 일반 모터 동작
+    PRIORITY_POLL   = 2     # 주기적인 센서 조회
+    
+    __STOP = float('inf')
+    
+    
+    def __init__(self):
+        self.__queue    = PriorityQueue()
+        self.__counter  = itertools.count()
+        self.__closed   = False
+        self.__worker   = Thread(target=self.__run, name='OpenCRCommandScheduler', daemon=True)
+        self.__worker.start()
+    
+    
+    
+    def __run(self) -> None:
+        while True:
+            priority, _, job = self.__queue.get()
+            if priority == self.__STOP:
+                break
+            
+            future, fn, args, kwargs = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+    
+    def submit(self, priority: int, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        '''
+        fn(*args, **kwargs)를 우선순위 priority로 예약하고 Future를 반환합니다.
+        예) scheduler.submit(scheduler.PRIORITY_URGENT, oc.dxl_goalPosition, 13, 3000).result()
+        '''
+        if self.__closed:
+            raise RuntimeError('scheduler is closed')
+        
+        future = Future()
+        self.__queue.put((priority, next(self.__counter), (future, fn, args, kwargs)))
+        return future
+    
+    def close(self, timeout: float = None) -> None:
+        '''이미 예약된 명령을 모두 실행한 뒤 작업 스레드를 종료합니다.'''
+        if self.__closed:
+            return
+        self.__closed = True
+        self.__queue.put((self.__STOP, next(self.__counter), None))
+        self.__worker.join(timeout)
@@ -0,0 +1,50 @@
+### Imports ###
+import time
+from collections import deque
+from typing import List, NamedTuple, Optional
+
+
+### Class ###
+class SensorSample(NamedTuple):
+    microphoto_1: int
+    microphoto_2: int
+    tdtl: int
+    tick: int       # OpenCR 측 타임스탬프(ms, 16bit 순환)
+    stamp: float    # 수신 시각(time.monotonic)
+
+
+class SensorStream:
+    '''
+    OpenCR이 push 하는 센서 샘플 저장소
+    reader 스레드만 push 하고, 다른 스레드는 잠금 없이 latest/history를 읽습니다.
+    (참조 대입과 deque.append는 원자적이므로 별도의 락이 필요 없습니다)
+    '''
+    def __init__(self, history: int = 256):
+        self.__latest: SensorSample = None
+        self.__ring                 = deque(maxlen=history)
+    
+    
+    
+    def push(self, sample: SensorSample) -> None:
+        self.__ring.append(sample)
+        self.__latest = sample
+    
+    @property
+    def latest(self) -> Optional[SensorSample]:
+        return self.__latest
+    
+    def get(self, max_age: float = None) -> Optional[SensorSample]:
+        '''
+        가장 최근 샘플을 반환합니다.
+        max_age(s)보다 오래된 샘플이거나 아직 수신된 샘플이 없으면 None
+        '''
+        sample = self.__latest
+        if sample is None:
+            return None
+        if max_age is not None and time.monotonic() - sample.stamp > max_age:
+            return None
+        return sample
+    
+    def history(self) -> List[SensorSample]:
+        '''오래된 순서의 최근 샘플 목록'''
+        return list(self.__ring)
@@ -0,0 +1,14 @@
+'''
+본 프로젝트에서 사용하는 비전/제어 단계를 스레드와 크기 제한 큐로 연결하는 파이프라인 모듈
+'''
+
+
+
+__all__ = ['DropQueue', 'Stage', 'Pipeline', 'FrameBuffers', 'FrameProducts']
+
+
+
+from ._queue import DropQueue
+from ._stage import Stage, Pipeline
+from ._buffer import FrameBuffers
+from ._products import FrameProducts
\ No newline at end of file
@@ -0,0 +1,22 @@
+### Imports ###
+from typing import Tuple
+import numpy as np
+
+
+### Class ###
+class FrameBuffers:
+    '''
+    미리 할당한 같은 크기의 배열 slots개를 돌려 쓰는 링 버퍼
+    next()는 매번 새로 할당하지 않고 다음 슬롯을 반환하므로 cv2.resize(..., dst=) 등의 출력 버퍼로 씁니다.
+    슬롯은 slots번 뒤에 다시 쓰이므로 slots는 파이프라인에 동시에 떠 있을 수 있는 프레임 수보다 커야 합니다.
+    '''
+    def __init__(self, shape: Tuple[int, ...], dtype=np.uint8, slots: int = 4):
+        self.__buffers  = [np.empty(shape, dtype=dtype) for _ in range(slots)]
+        self.__index    = 0
+    
+    
+    
+    def next(self) -> np.ndarray:
+        buf = self.__buffers[self.__index]
+        self.__index = (self.__index + 1) % len(self.__buffers)
+        return buf
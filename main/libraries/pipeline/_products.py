@@ -0,0 +1,47 @@
+### Imports ###
+from threading import RLock
+from typing import Any, Callable, Dict, List
+
+
+### Class ###
+class FrameProducts:
+    '''
+    한 프레임에서 파생되는 결과(정렬 depth, 색상화 depth, 축소 color 등)의 지연 계산 캐시
+    product[name]을 처음 요청할 때 producers[name](product)로 한 번만 계산하고 이후 요청은 같은 값을 공유합니다.
+    아무도 요청하지 않은 결과는 계산하지 않으며, 여러 단계(스레드)가 동시에 요청해도 한 번만 계산됩니다.
+    단계 간 결과 전달용으로 dict처럼 값을 넣고(product[name] = value) 계산 여부를 확인(name in product)할 수 있습니다.
+    '''
+    def __init__(self, producers: Dict[str, Callable[['FrameProducts'], Any]], **values):
+        self.__producers    = producers
+        self.__values       = dict(values)
+        self.__lock         = RLock()     # producer가 다른 결과를 요청할 수 있으므로 재진입 가능
+    
+    
+    
+    def __getitem__(self, name: str) -> Any:
+        try:
+            return self.__values[name]
+        except KeyError:
+            pass
+        with self.__lock:
+            if name not in self.__values:
+                if name not in self.__producers:
+                    raise KeyError(name)
+                self.__values[name] = self.__producers[name](self)
+            return self.__values[name]
+    
+    def __setitem__(self, name: str, value: Any) -> None:
+        self.__values[name] = value
+    
+    def __contains__(self, name: str) -> bool:
+        '''이미 계산되었거나 넣은 값인지 (계산을 일으키지 않음)'''
+        return name in self.__values
+    
+    def get(self, name: str, default: Any = None) -> Any:
+        try:
+            return self[name]
+        except KeyError:
+            return default
+    
+    def computed(self) -> List[str]:
+        return list(self.__values)
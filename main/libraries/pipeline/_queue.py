@@ -0,0 +1,44 @@
+### Imports ###
+from collections import deque
+from queue import Empty
+from threading import Condition
+from typing import Any
+
+
+### Class ###
+class DropQueue:
+    '''
+    크기가 제한된 FIFO 큐, 가득 찬 상태에서 put()하면 가장 오래된 항목을 버립니다.
+    생산자가 소비자보다 빨라도 막히지 않고, 소비자는 항상 가장 최근 항목 쪽을 받습니다.
+    '''
+    def __init__(self, maxsize: int = 1):
+        if maxsize < 1:
+            raise ValueError('maxsize must be >= 1')
+        self.__items    = deque()
+        self.__maxsize  = maxsize
+        self.__cond     = Condition()
+        self.dropped    = 0
+    
+    
+    
+    def __len__(self) -> int:
+        return len(self.__items)
+    
+    def put(self, item: Any) -> None:
+        with self.__cond:
+            if len(self.__items) >= self.__maxsize:
+                self.__items.popleft()
+                self.dropped += 1
+            self.__items.append(item)
+            self.__cond.notify()
+    
+    def get(self, timeout: float = None) -> Any:
+        '''항목이 없으면 timeout(s)까지 기다리고, 그래도 없으면 queue.Empty'''
+        with self.__cond:
+            if not self.__cond.wait_for(lambda: self.__items, timeout):
+                raise Empty
+            return self.__items.popleft()
+    
+    def clear(self) -> None:
+        with self.__cond:
+            self.__items.clear()
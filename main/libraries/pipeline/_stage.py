@@ -0,0 +1,161 @@
+### Imports ###
+import time
+import traceback
+from queue import Empty
+from threading import Thread, Event
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from ._queue import DropQueue
+
+
+### Class ###
+class Stage(Thread):
+    '''
+    파이프라인의 한 단계, 자기 스레드에서 inbox의 항목마다 fn(item)을 실행해 결과를 outbox들에 넣습니다.
+    inbox가 None이면 소스 단계로 fn()을 반복 호출합니다.
+    fn이 None을 반환하면 그 항목은 다음 단계로 넘기지 않습니다.
+    fn의 예외는 세고 출력한 뒤(처음 한 번은 traceback까지) 다음 항목으로 넘어가지만,
+    max_errors번 연속 실패하면 failed로 표시하고 멈춘 뒤 on_fail(stage)을 호출합니다.
+    '''
+    def __init__(self,
+                 name: str,
+                 fn: Callable[..., Any],
+                 inbox: Optional[DropQueue] = None,
+                 outboxes: Sequence[DropQueue] = (),
+                 poll: float = 0.1,
+                 max_errors: int = 10,
+                 on_fail: Optional[Callable[['Stage'], None]] = None):
+        super().__init__(name=name, daemon=True)
+        self.__fn           = fn
+        self.__inbox        = inbox
+        self.__outboxes     = list(outboxes)
+        self.__poll         = poll
+        self.__max_errors   = max_errors
+        self.__on_fail      = on_fail
+        self.__stopped      = Event()
+        self.__consecutive  = 0         # 연속 실패 수
+        
+        self.count      = 0         # 처리한 항목 수
+        self.elapsed    = 0.0       # 마지막 항목 처리 시간(s)
+        self.error      = None      # 마지막 예외
+        self.errors     = 0         # 실패한 항목 수
+        self.failed     = False     # 연속 실패로 멈췄는지
+    
+    
+    
+    def run(self) -> None:
+        while not self.__stopped.is_set():
+            if self.__inbox is None:
+                args = ()
+            else:
+                try:
+                    args = (self.__inbox.get(self.__poll),)
+                except Empty:
+                    continue
+            
+            start = time.monotonic()
+            try:
+                out = self.__fn(*args)
+            except Exception as e:
+                self.error = e
+                self.errors += 1
+                self.__consecutive += 1
+                print(f'[{self.name}] {e!r} ({self.__consecutive}/{self.__max_errors})')
+                if self.errors == 1:
+                    traceback.print_exc()
+                if self.__consecutive >= self.__max_errors:
+                    print(f'[{self.name}] failed {self.__consecutive} times in a row, stopping')
+                    self.failed = True
+                    self.__stopped.set()
+                    if self.__on_fail is not None:
+                        self.__on_fail(self)
+                continue
+            self.__consecutive = 0
+            self.elapsed = time.monotonic() - start
+            self.count += 1
+            
+            if out is not None:
+                for outbox in self.__outboxes:
+                    outbox.put(out)
+    
+    def stop(self) -> None:
+        self.__stopped.set()
+
+
+class Pipeline:
+    '''
+    Stage와 DropQueue를 묶어 한 번에 시작/정지하는 파이프라인
+    예)
+        pipe = Pipeline()
+        frames = pipe.queue('frames')
+        pipe.add('capture', capture, outboxes=[frames])
+        pipe.add('infer', infer, inbox=frames, outboxes=[...])
+        with pipe: ...
+    한 단계라도 연속 실패로 멈추면(Stage.failed) 나머지 단계도 멈추고 failed가 True가 되며,
+    check()나 with 블록 종료 시 RuntimeError로 알립니다.
+    '''
+    def __init__(self, max_errors: int = 10):
+        self.__queues: Dict[str, DropQueue] = {}
+        self.__stages: Dict[str, Stage]     = {}
+        self.__max_errors                   = max_errors
+        self.__failed                       = Event()
+    
+    
+    
+    def queue(self, name: str, maxsize: int = 1) -> DropQueue:
+        self.__queues[name] = DropQueue(maxsize)
+        return self.__queues[name]
+    
+    def add(self,
+            name: str,
+            fn: Callable[..., Any],
+            inbox: Optional[DropQueue] = None,
+            outboxes: Sequence[DropQueue] = ()) -> Stage:
+        self.__stages[name] = Stage(name, fn, inbox, outboxes, max_errors=self.__max_errors, on_fail=self.__on_fail)
+        return self.__stages[name]
+    
+    def stage(self, name: str) -> Stage:
+        return self.__stages[name]
+    
+    def stats(self) -> Dict[str, dict]:
+        '''단계별 처리 수/처리 시간, 큐별 버린 항목 수'''
+        stats = {name: dict(count=s.count, elapsed=s.elapsed, errors=s.errors) for name, s in self.__stages.items()}
+        stats.update({name: dict(dropped=q.dropped) for name, q in self.__queues.items()})
+        return stats
+    
+    @property
+    def failed(self) -> bool:
+        return self.__failed.is_set()
+    
+    def failures(self) -> List[Stage]:
+        return [s for s in self.__stages.values() if s.failed]
+    
+    def check(self) -> None:
+        '''연속 실패로 멈춘 단계가 있으면 그 단계의 마지막 예외와 함께 RuntimeError'''
+        for stage in self.failures():
+            raise RuntimeError(f'pipeline stage {stage.name!r} failed') from stage.error
+    
+    def __on_fail(self, stage: Stage) -> None:
+        # 실패한 단계의 스레드에서 호출되므로 join 없이 정지만 요청
+        self.__failed.set()
+        for s in self.__stages.values():
+            s.stop()
+    
+    def start(self) -> 'Pipeline':
+        for stage in self.__stages.values():
+            stage.start()
+        return self
+    
+    def stop(self, timeout: float = None) -> None:
+        for stage in self.__stages.values():
+            stage.stop()
+        for stage in self.__stages.values():
+            if stage.is_alive():
+                stage.join(timeout)
+    
+    def __enter__(self) -> 'Pipeline':
+        return self.start()
+    
+    def __exit__(self, exc_type, *exc) -> None:
+        self.stop()
+        if exc_type is None:
+            self.check()
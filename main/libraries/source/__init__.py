@@ -0,0 +1,14 @@
+'''
+본 프로젝트에서 사용하는 카메라 프레임 소스 모듈
+실시간 RealSense 스트림과, 녹화한 세션을 재생하는 하드웨어 없는 소스를 같은 인터페이스로 제공합니다
+'''
+
+
+
+__all__ = ['FrameSource', 'RealSenseSource', 'Recorder', 'ReplaySource']
+
+
+
+from ._source import FrameSource, RealSenseSource
+from ._record import Recorder
+from ._replay import ReplaySource
\ No newline at end of file
@@ -0,0 +1,90 @@
+### Imports ###
+import os
+from queue import Queue
+from threading import Thread
+from typing import Optional, Sequence
+import numpy as np
+from ..depth import Intrinsics
+
+
+### Class ###
+class Recorder:
+    '''
+    color/depth 프레임을 chunk 단위 .npz로 녹화 (ReplaySource로 재생)
+      <path>/meta.npz           : intrinsics(width, height, fx, fy, ppx, ppy), depth_scale
+      <path>/chunk_00000.npz    : color (N,H,W,3) uint8, depth (N,H,W) uint16, stamp (N,) float64(s)
+    depth는 color에 정렬된 z16 배열과 그 intrinsics를 기록합니다.
+    프레임은 미리 할당한 chunk 배열에 복사만 하고, 압축/저장은 별도 스레드에서 수행해 캡처 스레드를 막지 않습니다.
+    저장이 밀리면 write()가 대기합니다. (프레임을 버리지 않음)
+    '''
+    def __init__(self, path: str, depth_scale: float, chunk: int = 64, compress: bool = True):
+        self.path           = path
+        self.depth_scale    = depth_scale
+        self.chunk          = chunk
+        self.compress       = compress
+        self.intrinsics: Optional[Intrinsics] = None
+        self.count          = 0         # 기록한 프레임 수
+        
+        self.__buffers      = None      # 채우는 중인 (color, depth, stamp)
+        self.__filled       = 0
+        self.__chunks       = 0
+        self.__queue        = Queue(maxsize=2)
+        self.__writer       = Thread(target=self.__write_chunks, name='recorder', daemon=True)
+        
+        os.makedirs(path, exist_ok=True)
+        self.__writer.start()
+    
+    
+    
+    def write(self, color: np.ndarray, depth: np.ndarray, intrinsics: Sequence, stamp: float) -> None:
+        '''
+        color: (H,W,3) BGR, depth: (H,W) z16 (color에 정렬), intrinsics: Intrinsics 또는 같은 필드의 값, stamp: 촬영 시각(s)
+        '''
+        if self.intrinsics is None:
+            self.intrinsics = Intrinsics(*intrinsics)
+            np.savez(os.path.join(self.path, 'meta.npz'),
+                     intrinsics=np.asarray(self.intrinsics, dtype=float), depth_scale=self.depth_scale)
+        
+        if self.__buffers is None:
+            self.__buffers = (np.empty((self.chunk,) + color.shape, np.uint8),
+                              np.empty((self.chunk,) + depth.shape, np.uint16),
+                              np.empty(self.chunk, np.float64))
+        colors, depths, stamps = self.__buffers
+        np.copyto(colors[self.__filled], color)
+        np.copyto(depths[self.__filled], depth)
+        stamps[self.__filled] = stamp
+        self.__filled += 1
+        self.count += 1
+        
+        if self.__filled == self.chunk:
+            self.__flush()
+    
+    def close(self) -> None:
+        '''남은 프레임을 저장하고 저장 스레드가 끝날 때까지 대기'''
+        if self.__filled:
+            self.__flush()
+        self.__queue.put(None)
+        self.__writer.join()
+    
+    def __flush(self) -> None:
+        colors, depths, stamps = self.__buffers
+        n = self.__filled
+        self.__queue.put((self.__chunks, colors[:n], depths[:n], stamps[:n]))
+        self.__chunks += 1
+        self.__buffers = None       # 저장 스레드가 쓰는 동안 새 배열에 기록
+        self.__filled = 0
+    
+    def __write_chunks(self) -> None:
+        save = np.savez_compressed if self.compress else np.savez
+        while True:
+            item = self.__queue.get()
+            if item is None:
+                return
+            index, colors, depths, stamps = item
+            save(os.path.join(self.path, f'chunk_{index:05d}.npz'), color=colors, depth=depths, stamp=stamps)
+    
+    def __enter__(self) -> 'Recorder':
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
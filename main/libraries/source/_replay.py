@@ -0,0 +1,107 @@
+### Imports ###
+import glob
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+import cv2
+import numpy as np
+from ..depth import DepthImage, Intrinsics
+from ._source import FrameSource
+
+
+### Class ###
+class ReplaySource(FrameSource):
+    '''
+    Recorder로 녹화한 세션을 재생하는 프레임 소스 (카메라 없이 비전 경로 프로파일링/벤치마크)
+    realtime=False  : 읽는 즉시 다음 프레임 (최대 속도)
+    realtime=True   : 녹화 시각(stamp) 간격대로 맞춰 재생 (speed 배속)
+    loop=True면 끝에서 처음으로 돌아가고, 아니면 끝난 뒤 finished가 True가 됩니다.
+    depth는 DepthImage(z16 배열 + intrinsics)로 제공되어 DepthQuery/DepthRefiner에 그대로 쓸 수 있습니다.
+    다음 chunk는 별도 스레드에서 미리 읽습니다.
+    '''
+    def __init__(self, path: str, realtime: bool = False, speed: float = 1.0, loop: bool = False):
+        self.path       = path
+        self.realtime   = realtime
+        self.speed      = speed
+        self.loop       = loop
+        self.intrinsics: Optional[Intrinsics] = None
+        self.depth_scale = None
+        
+        self.__files    = sorted(glob.glob(os.path.join(path, 'chunk_*.npz')))
+        self.__next     = 0         # 다음에 읽을 chunk 번호
+        self.__chunk    = None      # (color, depth, stamp)
+        self.__index    = 0
+        self.__pending  = None      # 미리 읽는 중인 chunk Future
+        self.__loader   = ThreadPoolExecutor(max_workers=1)
+        self.__origin   = None      # 재생 기준 (벽시계, stamp)
+        self.__finished = False
+        
+        self.products = {
+            "depth_filtered": lambda frame: frame["depth"],     # 녹화된 depth를 그대로 사용
+            "depth_vis":      self.__depth_vis,
+        }
+    
+    
+    
+    @property
+    def finished(self) -> bool:
+        return self.__finished
+    
+    def start(self) -> float:
+        meta = np.load(os.path.join(self.path, 'meta.npz'))
+        intr = meta['intrinsics']
+        self.intrinsics = Intrinsics(int(intr[0]), int(intr[1]), *(float(v) for v in intr[2:]))
+        self.depth_scale = float(meta['depth_scale'])
+        if not self.__files:
+            raise FileNotFoundError(f'no chunk_*.npz in {self.path}')
+        self.__prefetch()
+        return self.depth_scale
+    
+    def read(self) -> Optional[Dict[str, Any]]:
+        if self.__finished:
+            time.sleep(0.1)     # 소스 단계가 헛돌지 않도록
+            return None
+        
+        if self.__chunk is None or self.__index >= len(self.__chunk[2]):
+            if self.__pending is None:
+                self.__finished = True
+                return None
+            self.__chunk = self.__pending.result()
+            self.__index = 0
+            self.__prefetch()
+        
+        colors, depths, stamps = self.__chunk
+        i = self.__index
+        self.__index += 1
+        
+        stamp = float(stamps[i])
+        if self.realtime:
+            if self.__origin is None or stamp < self.__origin[1]:   # 처음 또는 loop로 되돌아감
+                self.__origin = (time.monotonic(), stamp)
+            delay = self.__origin[0] + (stamp - self.__origin[1]) / self.speed - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        
+        return dict(color=colors[i], depth=DepthImage(depths[i], self.intrinsics), stamp=stamp)
+    
+    def stop(self) -> None:
+        self.__loader.shutdown(wait=False)
+    
+    def __prefetch(self) -> None:
+        if self.__next >= len(self.__files):
+            if not self.loop:
+                self.__pending = None
+                return
+            self.__next = 0
+        self.__pending = self.__loader.submit(self.__load, self.__files[self.__next])
+        self.__next += 1
+    
+    @staticmethod
+    def __load(file: str):
+        with np.load(file) as data:
+            return data['color'], data['depth'], data['stamp']
+    
+    def __depth_vis(self, frame) -> np.ndarray:
+        # z16 값 0 ~ 8500(255/0.03)을 컬러맵으로 표시
+        return cv2.applyColorMap(cv2.convertScaleAbs(frame["depth"].data, alpha=0.03), cv2.COLORMAP_JET)
@@ -0,0 +1,139 @@
+### Imports ###
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Optional
+import numpy as np
+try:
+    import pyrealsense2 as rs
+except ImportError:     # 녹화 재생(ReplaySource)만 쓰는 개발 PC에는 없어도 됨
+    rs = None
+
+
+### Class ###
+class FrameSource(ABC):
+    '''
+    카메라 프레임 소스 공통 인터페이스
+      start()   : 스트림을 시작하고 depth_scale(z16 값 1당 m)을 반환
+      read()    : 다음 프레임의 초기값 dict (FrameProducts(products, **values)로 감쌈), 프레임이 없으면 None
+      products  : 이 소스의 프레임에서 지연 계산하는 결과 {name: fn(frame)}
+      finished  : 더 읽을 프레임이 없으면 True (재생 끝)
+      stop()    : 스트림 정지
+    어느 소스든 frame["color"](BGR 배열), frame["depth"](color에 정렬된 depth 프레임), frame["stamp"](s)를 제공합니다.
+    start()/read()를 구현하지 않은 소스는 생성 시점에 TypeError가 납니다.
+    '''
+    products: Dict[str, Callable[[Any], Any]] = {}
+    
+    
+    
+    @property
+    def finished(self) -> bool:
+        return False
+    
+    @abstractmethod
+    def start(self) -> float:
+        ...
+    
+    @abstractmethod
+    def read(self) -> Optional[Dict[str, Any]]:
+        ...
+    
+    def stop(self) -> None:
+        pass
+
+
+class RealSenseSource(FrameSource):
+    '''
+    RealSense color/depth 스트림
+    depth 정렬(rs.align)/필터/색상화는 해당 결과를 요청하는 단계에서만 계산합니다.
+    '''
+    def __init__(self, width: int = 640, height: int = 480, fps: int = 30, use_filters: bool = False):
+        if rs is None:
+            raise ImportError('pyrealsense2 is required for RealSenseSource')
+        self.pipeline       = rs.pipeline()
+        self.config         = rs.config()
+        self.config.enable_stream(rs.stream.color, width, height, rs.format.bgr8, fps)
+        self.config.enable_stream(rs.stream.depth, width, height, rs.format.z16,  fps)
+        self.align          = rs.align(rs.stream.color)
+        self.use_filters    = use_filters
+        if self.use_filters:
+            # self.decimate  = rs.decimation_filter()   # 다운샘플로 노이즈 완화
+            self.spatial    = rs.spatial_filter()       # 공간 필터
+            self.temporal   = rs.temporal_filter()      # 시간 필터
+            self.holefill   = rs.hole_filling_filter()  # 홀 채움
+        self.colorizer      = rs.colorizer()            # 시각화용
+        self.colorizer.set_option(rs.option.color_scheme, 0)
+        
+        self.products = {
+            "color":          self.__color,             # 컬러 (정렬 대상이 color라 정렬 불필요)
+            "aligned":        self.__aligned,           # color에 정렬한 frameset (rs.align)
+            "depth":          self.__depth,             # 정렬된 depth 프레임 (좌표 계산용)
+            "depth_filtered": self.__depth_filtered,
+            "depth_vis":      self.__depth_vis,         # 색상화 depth (시각화용)
+        }
+    
+    
+    
+    def start(self) -> float:
+        self.profile = self.pipeline.start(self.config)
+        self.device = self.profile.get_device()
+        
+        # 제품군 확인: "L500" 또는 "D400"
+        product_line = self.device.get_info(rs.camera_info.product_line)
+        
+        # 공통: depth sensor 핸들
+        self.depth_sensor = self.device.first_depth_sensor()
+        
+        # 제품군별 설정
+        if product_line == "L500":
+            # L515 전용 프리셋(사용 중 코드 유지)
+            try:
+                self.depth_sensor.set_option(rs.option.visual_preset,
+                                             rs.l500_visual_preset.short_range)
+            except Exception:
+                pass
+        else:
+            # D415(D400 시리즈): L500 프리셋 없음 → 에미터/레이저 파워만 적절히 설정
+            try:
+                # 에미터 켜기(깊이 품질 향상, 필요 시 0으로 꺼도 됨)
+                if self.depth_sensor.supports(rs.option.emitter_enabled):
+                    self.depth_sensor.set_option(rs.option.emitter_enabled, 1)
+                # 레이저 파워(장비/환경 따라 조절, 1~ 최대치 범위. 과포화시 낮추기)
+                if self.depth_sensor.supports(rs.option.laser_power):
+                    rng = self.depth_sensor.get_option_range(rs.option.laser_power)
+                    self.depth_sensor.set_option(rs.option.laser_power, min(200, rng.max))
+            except Exception:
+                pass
+        
+        return self.depth_sensor.get_depth_scale()
+    
+    def read(self) -> Optional[Dict[str, Any]]:
+        frames = self.pipeline.wait_for_frames()
+        if not frames.get_color_frame() or not frames.get_depth_frame():
+            return None
+        frames.keep()   # 다른 스레드에서 쓰는 동안 프레임 풀로 반환되지 않도록
+        return dict(frames=frames, stamp=frames.get_timestamp() / 1000.0)
+    
+    def stop(self) -> None:
+        self.pipeline.stop()
+    
+    def __color(self, frame) -> np.ndarray:
+        return np.asanyarray(frame["frames"].get_color_frame().get_data())
+    
+    def __aligned(self, frame):
+        aligned = self.align.process(frame["frames"])
+        aligned.keep()
+        return aligned
+    
+    def __depth(self, frame):
+        return frame["aligned"].get_depth_frame()
+    
+    def __depth_filtered(self, frame):
+        depth = frame["depth"]
+        if self.use_filters:
+            # depth = self.decimate.process(depth)
+            depth = self.spatial.process(depth)
+            depth = self.temporal.process(depth)
+            depth = self.holefill.process(depth)
+        return depth
+    
+    def __depth_vis(self, frame) -> np.ndarray:
+        return np.asanyarray(self.colorizer.colorize(frame["depth_filtered"]).get_data())
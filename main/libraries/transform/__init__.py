@@ -0,0 +1,12 @@
+'''
+본 프로젝트에서 사용하는 카메라-로봇 좌표 변환 모듈
+'''
+
+
+
+__all__ = ['HandEye', 'pose_to_matrix', 'matrix_to_pose', 'compose_pose']
+
+
+
+from ._handeye import HandEye
+from ._pose import pose_to_matrix, matrix_to_pose, compose_pose
\ No newline at end of file
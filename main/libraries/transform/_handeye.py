@@ -0,0 +1,83 @@
+### Imports ###
+import os
+from typing import Sequence, Tuple
+import numpy as np
+
+
+### Class ###
+class HandEye:
+    '''
+    카메라 좌표 -> 로봇 좌표 변환
+      scale : 추론 이미지(320x320) 픽셀 -> 카메라 이미지(640x480) 픽셀 배율 (sx, sy)
+      T     : 카메라 좌표(m) -> 로봇 수확 대기 자세 기준 이동량(m) 4x4 동차 행렬
+    기본 T는 기존 indyCTL.run의 상수(-(x-0.32), y, -(z-0.24))와 같습니다.
+    fit()으로 기록한 (카메라 점, 로봇 점) 쌍에서 회전/이동을 추정할 수 있습니다. (Kabsch)
+    '''
+    DEFAULT_T = np.array([[-1.0, 0.0,  0.0, 0.32],
+                          [ 0.0, 1.0,  0.0, 0.00],
+                          [ 0.0, 0.0, -1.0, 0.24],
+                          [ 0.0, 0.0,  0.0, 1.00]])
+    
+    
+    def __init__(self, T: np.ndarray = None, scale: Tuple[float, float] = (2.0, 1.5)):
+        self.T      = np.array(self.DEFAULT_T if T is None else T, dtype=float).reshape(4, 4)
+        self.scale  = np.asarray(scale, dtype=float).reshape(2)
+    
+    
+    
+    @classmethod
+    def load(cls, path: str) -> 'HandEye':
+        '''save()로 저장한 .npz, 파일이 없으면 기본값'''
+        if not os.path.exists(path):
+            return cls()
+        data = np.load(path)
+        return cls(data['T'], data['scale'])
+    
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        np.savez(path, T=self.T, scale=self.scale)
+    
+    def to_image(self, uv: Sequence) -> np.ndarray:
+        '''(N,2) 추론 이미지 픽셀 -> (N,2) 카메라 이미지 픽셀'''
+        return np.asarray(uv, dtype=float).reshape(-1, 2) * self.scale
+    
+    def camera_to_robot(self, points: Sequence) -> np.ndarray:
+        '''(N,3) 카메라 좌표(m) -> (N,3) 로봇 좌표(m)'''
+        P = np.asarray(points, dtype=float).reshape(-1, 3)
+        return P @ self.T[:3, :3].T + self.T[:3, 3]
+    
+    def pixels_to_robot(self, uv: Sequence, z: Sequence, intr) -> np.ndarray:
+        '''
+        (N,2) 추론 이미지 픽셀과 (N,) 거리(m) -> (N,3) 로봇 좌표(m)
+        intr: fx, fy, ppx, ppy를 가진 카메라 intrinsics (libraries.depth.Intrinsics 등)
+        '''
+        img = self.to_image(uv)
+        z = np.asarray(z, dtype=float).reshape(-1)
+        P = np.stack([(img[:, 0] - intr.ppx) / intr.fx * z,
+                      (img[:, 1] - intr.ppy) / intr.fy * z,
+                      z], axis=1)
+        return self.camera_to_robot(P)
+    
+    @classmethod
+    def fit(cls, camera_points: Sequence, robot_points: Sequence, scale: Tuple[float, float] = (2.0, 1.5)) -> 'HandEye':
+        '''
+        대응점 쌍(N >= 3, 한 직선 위에 있지 않음)에서 robot = R @ camera + t 를 최소제곱으로 추정
+        '''
+        A = np.asarray(camera_points, dtype=float).reshape(-1, 3)
+        B = np.asarray(robot_points, dtype=float).reshape(-1, 3)
+        if len(A) != len(B) or len(A) < 3:
+            raise ValueError('need at least 3 point pairs')
+        
+        ca, cb = A.mean(axis=0), B.mean(axis=0)
+        U, _, Vt = np.linalg.svd((A - ca).T @ (B - cb))
+        D = np.diag([1.0, 1.0, np.sign(np.linalg.det(Vt.T @ U.T))])    # 반사 제거
+        R = Vt.T @ D @ U.T
+        
+        T = np.eye(4)
+        T[:3, :3] = R
+        T[:3, 3] = cb - R @ ca
+        return cls(T, scale)
+    
+    def residuals(self, camera_points: Sequence, robot_points: Sequence) -> np.ndarray:
+        '''(N,) 각 대응점의 변환 오차(m)'''
+        return np.linalg.norm(self.camera_to_robot(camera_points) - np.asarray(robot_points, dtype=float).reshape(-1, 3), axis=1)
@@ -0,0 +1,51 @@
+### Imports ###
+from typing import Sequence
+import numpy as np
+
+
+### Function ###
+# Indy 작업 좌표 [x, y, z, u, v, w]: 위치(m)와 고정축 X, Y, Z 회전(deg), R = Rz(w) @ Ry(v) @ Rx(u)
+
+def pose_to_matrix(pose: Sequence[float]) -> np.ndarray:
+    '''[x, y, z, u, v, w] -> 4x4 동차 행렬'''
+    x, y, z, u, v, w = (float(p) for p in pose)
+    cu, su = np.cos(np.radians(u)), np.sin(np.radians(u))
+    cv, sv = np.cos(np.radians(v)), np.sin(np.radians(v))
+    cw, sw = np.cos(np.radians(w)), np.sin(np.radians(w))
+    T = np.eye(4)
+    T[:3, :3] = [[cw*cv, cw*sv*su - sw*cu, cw*sv*cu + sw*su],
+                 [sw*cv, sw*sv*su + cw*cu, sw*sv*cu - cw*su],
+                 [  -sv,            cv*su,            cv*cu]]
+    T[:3, 3] = (x, y, z)
+    return T
+
+def matrix_to_pose(T: np.ndarray, ref: Sequence[float] = None) -> list:
+    '''
+    4x4 동차 행렬 -> [x, y, z, u, v, w]
+    같은 회전을 나타내는 두 각도 해 중 ref(작업 좌표)의 각도에 가까운 쪽을 고르고, 각 각도를 ref 근처(±180)로 맞춤
+    '''
+    T = np.asarray(T, dtype=float)
+    R = T[:3, :3]
+    v = np.degrees(np.arcsin(np.clip(-R[2, 0], -1.0, 1.0)))
+    if abs(abs(v) - 90.0) < 1e-6:
+        # 짐벌 락: u와 w가 한 축으로 겹치므로 u = 0
+        candidates = [(0.0, v, np.degrees(np.arctan2(-R[0, 1], R[1, 1])))]
+    else:
+        u = np.degrees(np.arctan2(R[2, 1], R[2, 2]))
+        w = np.degrees(np.arctan2(R[1, 0], R[0, 0]))
+        candidates = [(u, v, w), (u + 180.0, 180.0 - v, w + 180.0)]
+    
+    ref_uvw = np.zeros(3) if ref is None else np.asarray(ref, dtype=float)[3:6]
+    best = None
+    for uvw in candidates:
+        uvw = ref_uvw + (np.asarray(uvw) - ref_uvw + 180.0) % 360.0 - 180.0
+        cost = float(np.abs(uvw - ref_uvw).sum())
+        if best is None or cost < best[0]:
+            best = (cost, uvw)
+    return [float(p) for p in T[:3, 3]] + [float(a) for a in best[1]]
+
+def compose_pose(pose: Sequence[float], offset: Sequence[float]) -> list:
+    '''
+    pose에서 도구 좌표계 기준으로 offset([dx, dy, dz, du, dv, dw], task_move_by와 같은 형식)만큼 이동한 절대 작업 좌표
+    '''
+    return matrix_to_pose(pose_to_matrix(pose) @ pose_to_matrix(offset), ref=pose)
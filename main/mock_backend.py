@@ -0,0 +1,155 @@
+from endeffector import endeffectorCTL
+import threading
+import time
+
+# 하드웨어 없이 파이프라인을 실행/프로파일링하기 위한 모의 백엔드
+# indyCTL(mock=True)가 IndyDCP2/endeffectorCTL 대신 사용하며, 수확 루프와 상태 기계는 실제 코드가 그대로 동작
+
+class indyDCPMock():
+    """
+    IndyDCP2 중 indyCTL이 쓰는 명령만 흉내 내는 모의 로봇
+    이동 명령은 move_time(s) 동안 busy 상태가 되고, 작업 좌표는 상대/절대 이동량만큼 갱신
+    관절 이동은 역기구학 없이 작업 좌표를 task_home으로 되돌림
+    """
+    def __init__(self, server_ip=None, robot_name=None, move_time=0.2):
+        self.server_ip = server_ip
+        self.robot_name = robot_name
+        self.move_time = move_time
+        self.task_home = [0.35, -0.19, 0.52, 0.0, 180.0, 0.0]
+        self.__task = list(self.task_home)
+        self.__move_end = 0.0
+        self.__joint_vel = 3
+        self.__task_vel = 3
+        self.__lock = threading.Lock()
+
+    def __move(self):
+        self.__move_end = time.monotonic() + self.move_time
+
+    def connect(self):
+        print(f"[mock] connect {self.robot_name} ({self.server_ip})")
+
+    def disconnect(self):
+        print("[mock] disconnect")
+
+    def reset_robot(self):
+        pass
+
+    def set_joint_vel_level(self, level):
+        self.__joint_vel = level
+
+    def set_task_vel_level(self, level):
+        self.__task_vel = level
+
+    def get_joint_vel_level(self):
+        return self.__joint_vel
+
+    def get_task_vel_level(self):
+        return self.__task_vel
+
+    def joint_move_to(self, q):
+        with self.__lock:
+            self.__task = list(self.task_home)
+            self.__move()
+
+    def go_home(self):
+        self.joint_move_to(None)
+
+    def task_move_by(self, t):
+        with self.__lock:
+            self.__task = [p + d for p, d in zip(self.__task, t)]
+            self.__move()
+
+    def task_move_to(self, t):
+        with self.__lock:
+            self.__task = list(t)
+            self.__move()
+
+    def stop_motion(self):
+        self.__move_end = 0.0
+
+    def wait_for_move_finish(self):
+        delay = self.__move_end - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def get_task_pos(self):
+        with self.__lock:
+            return list(self.__task)
+
+    def get_robot_status(self):
+        busy = int(time.monotonic() < self.__move_end)
+        return {'ready': 1, 'emergency': 0, 'collision': 0, 'error': 0, 'busy': busy, 'movedone': 1 - busy, 'home': 0, 'zero': 0}
+
+
+class endeffectorMock(endeffectorCTL):
+    """
+    OpenCR 없이 동작하는 모의 엔드이펙터
+    모터는 명령 즉시 목표 위치에 도달하고, 센서는 시간으로 흉내 냄
+      TDTL      : home() 후 tdtl_delay(s)가 지나면 1 (줄기 진입)
+      포토센서  : grasp_stem() 후 micro_delay(s)가 지나면 0 (잎자루 통과)
+    """
+    def __init__(self, tdtl_delay=1.0, micro_delay=0.5):
+        self.stream_max_age              = 0.1
+        self.GRIP_OPEN                   = 2048
+        self.GRIP_CLOSE                  = 950
+        self.WIRE_RELEASE                = 2500
+        self.WIRE_PULL                   = 3000
+
+        self.tdtl_delay = tdtl_delay
+        self.micro_delay = micro_delay
+        self.__positions = {11: self.GRIP_OPEN, 13: self.WIRE_RELEASE}
+        self.__tdtl_at = None
+        self.__micro_low_at = None
+
+    def __goal(self, targets):
+        self.__positions.update(targets)
+
+    def send_all(self, funccode, args_list, priority=None):
+        return [None for _ in args_list]
+
+    def home(self):
+        self.__goal({11: self.GRIP_OPEN, 13: self.WIRE_RELEASE})
+        self.__tdtl_at = time.monotonic() + self.tdtl_delay
+        self.__micro_low_at = None
+
+    def grasp_stem(self):
+        self.__goal({11: self.GRIP_CLOSE})
+        self.__micro_low_at = time.monotonic() + self.micro_delay
+
+    def release_stem(self):
+        self.__goal({11: self.GRIP_OPEN})
+
+    def pull_wire(self):
+        self.__goal({13: self.WIRE_PULL})
+
+    def release_wire(self):
+        self.__goal({13: self.WIRE_RELEASE})
+
+    def cut(self):
+        self.__goal({13: self.WIRE_PULL, 11: self.GRIP_OPEN})
+        self.__tdtl_at = None
+
+    def get_positions(self, ids=(11, 13)):
+        return [self.__positions[id] for id in ids]
+
+    def get_moving_status(self, ids=(11, 13)):
+        return [(0, self.__positions[id]) for id in ids]
+
+    def start_stream(self, period_ms=10):
+        return False
+
+    def stop_stream(self):
+        pass
+
+    def get_micro_photo(self):
+        micro = self.get_sensors()[0]
+        return [micro, micro]
+
+    def get_TDTL(self):
+        return self.get_sensors()[2]
+
+    def get_sensors(self):
+        now = time.monotonic()
+        tdtl = int(self.__tdtl_at is not None and now >= self.__tdtl_at)
+        micro = int(self.__micro_low_at is None or now < self.__micro_low_at)
+        return [micro, micro, tdtl]
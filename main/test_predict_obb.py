@@ -1,34 +1,50 @@
-import pyrealsense2 as rs
 import cv2
 import numpy as np
+import argparse
 import math
+import time
+from queue import Empty
 
 from indy7 import indyCTL
+from libraries.pipeline import Pipeline, FrameBuffers, FrameProducts
+from libraries.inference import InferenceBackend
+from libraries.depth import DepthQuery, DepthRefiner
+from libraries.source import RealSenseSource, ReplaySource, Recorder
 
-from ultralytics import YOLO
-
-from utils.box_angle import rotate_box_edge_towards_center_by_midpoint
-from utils.nearest_box import assign_points_to_nearest_box, closest_edge_midpoints
+from utils.box_angle import rotate_boxes_edge_towards_center_by_midpoint
+from utils.nearest_box import closest_edge_midpoints
+from utils.pairing import pair_midpoints
+from utils.detections import Detections, Entities
 
 class camera():
-    def __init__(self):
+    def __init__(self, source=None, mock=False, record=None):
         super().__init__()
-        # RealSense 파이프라인 초기화
-        self.pipeline = rs.pipeline()
-        self.config = rs.config()
-        self.config.enable_stream(rs.stream.color, 640, 480, rs.format.bgr8,    30)
-        self.config.enable_stream(rs.stream.depth, 640, 480, rs.format.z16,     30)
-        self.align = rs.align(rs.stream.color)
+        # 프레임 소스: 기본은 RealSense, 녹화 재생은 libraries.source.ReplaySource
+        self.source = RealSenseSource() if source is None else source
+        self.record_path = record   # 경로를 주면 color/정렬된 depth를 ReplaySource용으로 녹화
+        self.recorder = None
         self.click_point = None
-        self.use_filters = False
-        if self.use_filters:
-            # self.decimate  = rs.decimation_filter()   # 다운샘플로 노이즈 완화
-            self.spatial   = rs.spatial_filter()      # 공간 필터
-            self.temporal  = rs.temporal_filter()     # 시간 필터
-            self.holefill  = rs.hole_filling_filter() # 홀 채움
-
-        self.indy = indyCTL()
-        self.model = YOLO("model/best.pt")
+        self.headless = False       # True : 창/그리기 없이 동작 (모니터 없는 Jetson), 수확은 자동 시작
+        self.auto_harvest = False   # True : 클릭 없이 깻잎이 검출되면 플래너 순서대로 바로 수확
+        self.view_fps = 10          # 시각화 최대 FPS, 그리기는 이 주기의 프레임에서만 수행
+        self.pair_max_dist = None   # 중점-Harvest_leaf 매칭 허용 거리(px, 320x320 기준), 넘으면 매칭하지 않음 (None : 가장 가까운 박스만, 기존 규칙)
+        self.pair_dropped = 0       # 허용되지 않아 버린 매칭 수 (누적)
+        self.depth_radius = 3       # 깊이 질의 영역 반경(px), 중심 주변 (2r+1)^2 픽셀의 중앙값 사용
+        self.depth_query = None
+        self.refine_depth = True    # 좌표 계산 전 검출 영역(ROI)만 구멍 채우기 + 공간 필터
+        self.depth_refiner = None
+        self.next_view = 0.0
+        self.harvest_end = 0.0      # 마지막 수확이 끝난 시각(time.monotonic), 그 전에 찍힌 프레임으로는 수확하지 않음
+        self.q_dispatch = None
+
+        self.indy = indyCTL(mock=mock)     # mock=True : 로봇/엔드이펙터 없이 실행
+        self.backend = 'torch'      # 'torch' | 'onnx' | 'tensorrt'
+        self.precision = 'fp32'     # 'fp32' | 'fp16' | 'int8'(tensorrt, calib_data 필요)
+        self.calib_data = None      # libraries.inference.make_calibration_set()으로 만든 data.yaml
+        self.model = InferenceBackend("model/best.pt", backend=self.backend, imgsz=320,
+                                      precision=self.precision, calib_data=self.calib_data)
+        print("Warm-up: ", self.model.warmup())    # 첫 프레임 지연 없이 바로 추론하도록
+        self.resized = FrameBuffers((320, 320, 3))  # 추론 입력 크기로 줄인 프레임, 매 프레임 할당하지 않고 재사용
 
     def draw_obb_point_list(self, image, points, color=(255, 0, 0), thickness=1):
         """
@@ -59,7 +75,8 @@ class camera():
             i, j = edges[k]
             mx = (pts[i, 0] + pts[j, 0]) / 2.0
             my = (pts[i, 1] + pts[j, 1]) / 2.0
-            cv2.circle(image, (int(mx), int(my)), 4, (0, 0, 255), -1)
+            if image is not None:
+                cv2.circle(image, (int(mx), int(my)), 4, (0, 0, 255), -1)
             output_points.append([int(mx), int(my)])
 
         return output_points
@@ -91,249 +108,203 @@ class camera():
             print(f"Clicked pixel: (u={x}, v={y})")
             self.click_point = True
 
-    def angles_from_pixel(self, depth_frame, u=200, v=200):
-        w = depth_frame.get_width()
-        h = depth_frame.get_height()
-        u = int(max(0, min(w - 1, round(u))))
-        v = int(max(0, min(h - 1, round(v))))
-        z = depth_frame.get_distance(u, v)
-        if z <= 0:
+    def angles_from_pixel(self, depth_frame, u=200, v=200, depth=None):
+        # (u, v) 주변 영역을 한 번에 역투영해 중앙값 사용, depth 구멍이 있어도 주변 픽셀로 계산
+        # intrinsics는 DepthQuery가 stream profile별로 캐시, depth는 ROI 후처리한 z16 배열(없으면 원본)
+        p = self.depth_query.query_point(depth_frame, u, v, radius=self.depth_radius, depth=depth)
+        if p is None:
             return None
-
-        # 반드시 "depth 프레임의" intrinsics 사용
-        depth_vsp  = depth_frame.get_profile().as_video_stream_profile()
-        depth_intr = depth_vsp.get_intrinsics()
-        X, Y, Z = rs.rs2_deproject_pixel_to_point(depth_intr, [u, v], z)
-        print(depth_intr)
+        X, Y, Z = (float(c) for c in p)
 
         theta = math.degrees(math.atan2(math.hypot(X, Y), Z))
         yaw   = math.degrees(math.atan2(X, Z))
         pitch = math.degrees(math.atan2(-Y, math.hypot(X, Z)))
-        return dict(distance_m=z, X=X, Y=Y, Z=Z,
+        return dict(distance_m=Z, X=X, Y=Y, Z=Z,
                     theta_deg=theta, yaw_deg=yaw, pitch_deg=pitch)
 
     def start(self):
-        self.profile = self.pipeline.start(self.config)
-        self.device = self.profile.get_device()
-
-        # 제품군 확인: "L500" 또는 "D400"
-        product_line = self.device.get_info(rs.camera_info.product_line)
-
-        # 공통: depth sensor 핸들
-        self.depth_sensor = self.device.first_depth_sensor()
-
-        # 제품군별 설정
-        if product_line == "L500":
-            # L515 전용 프리셋(사용 중 코드 유지)
-            try:
-                self.depth_sensor.set_option(rs.option.visual_preset,
-                                             rs.l500_visual_preset.short_range)
-            except Exception:
-                pass
-        else:
-            # D415(D400 시리즈): L500 프리셋 없음 → 에미터/레이저 파워만 적절히 설정
-            try:
-                # 에미터 켜기(깊이 품질 향상, 필요 시 0으로 꺼도 됨)
-                if self.depth_sensor.supports(rs.option.emitter_enabled):
-                    self.depth_sensor.set_option(rs.option.emitter_enabled, 1)
-                # 레이저 파워(장비/환경 따라 조절, 1~ 최대치 범위. 과포화시 낮추기)
-                if self.depth_sensor.supports(rs.option.laser_power):
-                    rng = self.depth_sensor.get_option_range(rs.option.laser_power)
-                    self.depth_sensor.set_option(rs.option.laser_power, min(200, rng.max))
-            except Exception:
-                pass
-
-        cv2.namedWindow("View")
-        cv2.setMouseCallback("View", self.mouse_callback)
-
-        colorizer = rs.colorizer()  # 시각화용
-        colorizer.set_option(rs.option.color_scheme, 0)
-
-        while True:
-            frames = self.pipeline.wait_for_frames()
-            aligned = self.align.process(frames)
-
-            color_frame = aligned.get_color_frame()
-            depth_frame = aligned.get_depth_frame()
-            if not color_frame or not depth_frame:
-                continue
-
-            depth_for_calc = depth_frame
-            depth_for_view = depth_frame
-
-            if self.use_filters:
-                # depth_for_view = self.decimate.process(depth_for_view)
-                depth_for_view = self.spatial.process(depth_for_view)
-                depth_for_view = self.temporal.process(depth_for_view)
-                depth_for_view = self.holefill.process(depth_for_view)
-
-            color_np = np.asanyarray(color_frame.get_data())
-            depth_vis = np.asanyarray(colorizer.colorize(depth_for_view).get_data())
-
-            view_color = color_np.copy()
-
-            img = cv2.resize(view_color, (320,320))
+        # 카메라 설정(제품군별 프리셋 등)은 소스가 담당
+        depth_scale = self.source.start()
+        self.depth_query = DepthQuery(depth_scale)
+        self.depth_refiner = DepthRefiner(depth_scale)
+        if self.record_path:
+            self.recorder = Recorder(self.record_path, depth_scale)
+
+        if self.headless:
+            self.auto_harvest = True
+
+        # 단계별 스레드 + 크기 제한(오래된 항목 버림) 큐
+        # capture -> infer -> geometry -> (dispatch, view)
+        # depth 정렬/필터/색상화는 FrameProducts로 필요한 단계가 요청할 때만 계산 (예: 수확 시 dispatch)
+        # 로봇이 수확하는 동안에도 추론은 계속 돌고, 수확이 끝나면 가장 최근 결과로 바로 다음 수확
+        pipe = Pipeline()
+        q_frames   = pipe.queue('frames')
+        q_infer    = pipe.queue('infer')
+        q_dispatch = pipe.queue('dispatch')
+        self.q_dispatch = q_dispatch
+        q_view     = pipe.queue('view')
+        q_show     = pipe.queue('show')
+
+        pipe.add('capture',  self.capture,                          outboxes=[q_frames])
+        pipe.add('infer',    self.infer,         inbox=q_frames,    outboxes=[q_infer])
+        pipe.add('geometry', self.geometry,      inbox=q_infer,     outboxes=[q_dispatch, q_view])
+        pipe.add('dispatch', self.dispatch,      inbox=q_dispatch)
+        if not self.headless:
+            pipe.add('view', self.compose,       inbox=q_view,      outboxes=[q_show])
+
+        # 프레임별 지연 계산 결과: 소스가 주는 color/depth/depth_vis 등 + 추론 입력
+        self.products = {
+            **self.source.products,
+            "img":            self.product_img,         # 추론 입력 크기로 줄인 컬러
+        }
+
+        # 한 단계가 계속 실패하면(pipe.failed) 파이프라인이 멈추고, 정리 후 그 예외로 종료
+        try:
+            with pipe:
+                if self.headless:
+                    # 창 없이 동작, Ctrl+C 또는 재생이 끝나면 종료
+                    try:
+                        while not self.source.finished and not pipe.failed:
+                            time.sleep(0.1)
+                    except KeyboardInterrupt:
+                        pass
+                else:
+                    # 시각화는 OpenCV 창 때문에 메인 스레드에서
+                    cv2.namedWindow("View")
+                    cv2.setMouseCallback("View", self.mouse_callback)
+                    while not self.source.finished and not pipe.failed:
+                        try:
+                            cv2.imshow('View', q_show.get(timeout=0.1))
+                        except Empty:
+                            pass
+
+                        if cv2.waitKey(1) & 0xFF == ord('q'):
+                            break
+        finally:
+            print(pipe.stats())
+            print("Dropped pairs: ", self.pair_dropped)
+            self.indy.close()
+            if not self.headless:
+                cv2.destroyAllWindows()
+            print("Stopping pipeline...")
+            self.source.stop()
+            if self.recorder is not None:
+                self.recorder.close()
+                print("Recorded: ", self.recorder.count, "frames ->", self.record_path)
+
+    def capture(self):
+        values = self.source.read()
+        if values is None:
+            return None
+        frame = FrameProducts(self.products, captured=time.monotonic(), **values)
+        if self.recorder is not None:
+            # 녹화 중에는 매 프레임 depth 정렬이 필요
+            depth = frame["depth"]
+            self.recorder.write(frame["color"], np.asanyarray(depth.get_data()),
+                                self.depth_query.intrinsics(depth), frame["stamp"])
+        return frame
+
+    def product_img(self, frame):
+        # 소스 버퍼(RealSense는 keep()으로 유지)에서 바로 재사용 버퍼로 축소, 중간 복사 없음
+        img = self.resized.next()
+        cv2.resize(frame["color"], (320,320), dst=img)
+        return img
+
+    def infer(self, frame):
+        frame["result"] = self.model.predict(frame["img"], conf=0.7)
+        return frame
+
+    def geometry(self, frame):
+        img = frame["img"]
+        result = frame["result"]
+
+        # 시각화 주기가 된 프레임에만 그리기, headless면 그리지 않음
+        now = time.monotonic()
+        draw = not self.headless and now >= self.next_view
+        if draw:
+            self.next_view = max(self.next_view + 1.0 / self.view_fps, now)
             show_img1 = img.copy()
             show_img2 = img.copy()
             show_img3 = img.copy()
-
-            result = self.model.predict(img, conf=0.7)
-
-            output_points   = []
-            harvest_leaves  = []
-            cls1_boxes      = []
-
-            print(result[0].obb.cls)
-
-            # step 1: Center_leaf 양쪽 변 중앙점 구하기
-            for points, cls in zip(result[0].obb.xyxyxyxy.tolist(), result[0].obb.cls.tolist()):
-                print(cls, points)
-                if cls == 0:
-                    self.draw_obb_point_list(image=show_img1, points=points)
-                    harvest_leaves.append(points)
-                else:
-                    self.draw_obb_point_list(image=show_img1, points=points, color=(0,255,0))
-                    out = self.center_two_point_draw(image=show_img1, points=points)
-                    output_points.append(out)
-                    cls1_boxes.append(points)
-
-            # step 2: Center_leaf와 가장 가까운 Harvest_leaf를 한 개체로 만들기
-            flat_points = [tuple(pt) for pair in output_points for pt in pair]
-            idxs, dists = assign_points_to_nearest_box(flat_points, harvest_leaves, max_dist=None)
-
-            entities = []
-            for i, (pts2, cls1_box) in enumerate(zip(output_points, cls1_boxes)):
-                pair_idxs  = idxs[2*i:2*i+2]    # [k1, k2]
-                pair_dists = dists[2*i:2*i+2]   # [d1, d2]
-                pair_boxes = [harvest_leaves[k] if k != -1 else None for k in pair_idxs]
-
-                # ── 엔티티 내부 유니크 강제: 같은 cls0를 두 중점이 가리키면 가까운 쪽만 유지
-                if pair_idxs[0] != -1 and pair_idxs[0] == pair_idxs[1]:
-                    if pair_dists[0] <= pair_dists[1]:
-                        # 0번 포인트 승자, 1번 포인트 탈락
-                        pair_idxs[1]  = -1
-                        pair_dists[1] = float('inf')
-                        pair_boxes[1] = None
-                    else:
-                        # 1번 포인트 승자, 0번 포인트 탈락
-                        pair_idxs[0]  = -1
-                        pair_dists[0] = float('inf')
-                        pair_boxes[0] = None
-
-                entity = {
-                    "cls1_index": i,
-                    "cls1_box": cls1_box,
-                    "midpoints": pts2,
-                    "paired_cls0_idxs": pair_idxs,     # 엔티티 내부 유니크 보장
-                    "paired_cls0_boxes": pair_boxes,
-                    "paired_dists": pair_dists,
-                }
-                entities.append(entity)
-
-            # idxs, dists 는 flat_points 기준
-            # m-th flat point → 엔티티 i = m//2, mid j = m%2
-            candidates = []
-            for m, (bi, dm) in enumerate(zip(idxs, dists)):
-                if bi == -1:
-                    continue
-                i, j = divmod(m, 2)  # 엔티티/중점 인덱스
-                candidates.append((dm, i, j, bi))  # (거리, cls1_i, mid_j, cls0_idx)
-
-            # 가까운 순 정렬 후, 승자만 남김
-            candidates.sort(key=lambda x: x[0])
-
-            used_cls0 = set()
-            assigned = {}  # (i,j) -> cls0_idx
-            for dm, i, j, bi in candidates:
-                if bi in used_cls0:
-                    continue
-                if (i, j) in assigned:  # 안전망 (중복 방지)
-                    continue
-                used_cls0.add(bi)
-                assigned[(i, j)] = bi
-
-            # 결과를 entities에 반영 (미승자는 -1 처리)
-            for i, e in enumerate(entities):
-                for j in range(2):
-                    if (i, j) in assigned:
-                        bi = assigned[(i, j)]
-                        e["paired_cls0_idxs"][j] = bi
-                        e["paired_cls0_boxes"][j] = harvest_leaves[bi]
-                        # dists 업데이트(선택): 이미 dm 알면 넣고, 아니면 그대로
-                    else:
-                        e["paired_cls0_idxs"][j] = -1
-                        e["paired_cls0_boxes"][j] = None
-                        e["paired_dists"][j] = float('inf')
-
-
-            for (x, y), bi in zip(flat_points, idxs):
+        else:
+            show_img1 = show_img2 = show_img3 = None
+
+        # 검출 결과를 한 번만 numpy로 옮겨 배열로 처리
+        dets = Detections.from_obb(result[0].obb)
+        harvest = dets[dets.cls == 0]       # Harvest_leaf
+        center = dets[dets.cls != 0]        # Center_leaf
+
+        print(dets.cls)
+
+        # step 1: Center_leaf 양쪽 변 중앙점 구하기
+        midpoints = np.trunc(center.long_edge_midpoints)   # (E,2,2)
+        if draw:
+            cv2.polylines(show_img1, list(harvest.boxes.astype(np.int32).reshape(-1,4,1,2)), True, (255, 0, 0), 1)
+            cv2.polylines(show_img1, list(center.boxes.astype(np.int32).reshape(-1,4,1,2)), True, (0, 255, 0), 1)
+            for mx, my in midpoints.reshape(-1, 2):
+                cv2.circle(show_img1, (int(mx), int(my)), 4, (0, 0, 255), -1)
+
+        # step 2: Center_leaf 중점과 Harvest_leaf를 1:1로 매칭해 한 개체로 만들기
+        # 헝가리안 매칭이라 한 Harvest_leaf는 최대 한 중점에만 배정됨 (엔티티 내부/사이 중복 없음)
+        pair_idxs, pair_dists, dropped = pair_midpoints(midpoints, harvest, max_dist=self.pair_max_dist, return_dropped=True)
+        self.pair_dropped += dropped
+        entities = Entities(center, harvest, midpoints, pair_idxs, pair_dists)
+
+        if draw:
+            centers = harvest.centers
+            for (x, y), bi in zip(midpoints.reshape(-1, 2), pair_idxs.reshape(-1)):
                 cv2.circle(show_img1, (int(x), int(y)), 4, (0, 255, 255), -1)  # 점 강조
                 if bi != -1:
                     # 선택된 박스의 테두리까지 최단점(투영점)을 구해 선으로 그려도 좋지만,
                     # 간단히 박스 중심으로 보조선만 표시:
-                    box = np.array(harvest_leaves[bi], dtype=float).reshape(4,2)
-                    bx, by = box[:,0].mean(), box[:,1].mean()
+                    bx, by = centers[bi]
                     cv2.line(show_img1, (int(x), int(y)), (int(bx), int(by)), (255, 255, 0), 1)
 
-            # 디버그 출력
-            print(f"#entities = {len(entities)}")
-            for e in entities:
-                print({
-                    "cls1_index": e["cls1_index"],
-                    "paired_cls0_idxs": e["paired_cls0_idxs"],
-                    "paired_dists": [round(d,2) for d in e["paired_dists"]],
-                })
-
-            # Step 3: Harvest_leaf가 Center_leaf의 중심을 바라보게 하기
-            for e in entities:
-                mids = e["midpoints"]              # [[mx1,my1],[mx2,my2]]  ← cls1 긴 변 중점 2개
-                cls1_box = e["cls1_box"]
-
-                e["rotated_cls0_boxes"] = []
-                e["rotated_angles"] = []
-
-                for j, cls0_box in enumerate(e["paired_cls0_boxes"]):
-                    if cls0_box is None:
-                        e["rotated_cls0_boxes"].append(None)
-                        e["rotated_angles"].append(None)
-                        continue
-
-                    ref_mid = tuple(mids[j])  # 이 중점에 가장 가까운 변을 선택
-                    rotated_cls0, theta_deg = rotate_box_edge_towards_center_by_midpoint(
-                        cls0_box, cls1_box, ref_midpoint_xy=ref_mid
-                    )
-
-                    e["rotated_cls0_boxes"].append(rotated_cls0)
-                    e["rotated_angles"].append(theta_deg)
-
-                    # 시각화(선택)
-                    cv2.polylines(show_img2, [rotated_cls0.astype(np.int32).reshape(-1,1,2)], True, (0,128,255), 2)
-                    # 보조선: 회전된 cls0 중심 → cls1 중심
-                    c0 = rotated_cls0.mean(axis=0)
-                    c1 = np.array(cls1_box, float).reshape(4,2).mean(axis=0)
-                    cv2.circle(show_img2, (int(c0[0]), int(c0[1])), 3, (255,255,0), -1)
-                    cv2.circle(show_img2, (int(c1[0]), int(c1[1])), 3, (0,255,255), -1)
-                    cv2.line(show_img2, (int(c0[0]), int(c0[1])), (int(c1[0]), int(c1[1])), (255,255,0), 1)
-
-            # Step 4: Harvest_leaf를 서로 연결하고 중심을 구해 깻잎개체의 중심 구하기
-            line_info_list = []  # [( (cx, cy), slope ), ...]
-
-            for e in entities:
-                rb0, rb1 = None, None
-                if len(e.get("rotated_cls0_boxes", [])) >= 2:
-                    rb0, rb1 = e["rotated_cls0_boxes"][0], e["rotated_cls0_boxes"][1]
-
-                # 두 박스가 모두 있어야 연결 가능
-                if rb0 is None or rb1 is None:
-                    continue
-
-                # 두 박스에서 가장 가까운 변의 중점 계산
-                midA, midB, ia, ib, dmin = closest_edge_midpoints(rb0, rb1)
-
-                # 중점 좌표 (정수화)
-                pA = (int(round(midA[0])), int(round(midA[1])))
-                pB = (int(round(midB[0])), int(round(midB[1])))
-
+        # 디버그 출력
+        print(f"#entities = {len(entities)}, dropped pairs = {dropped} (total {self.pair_dropped})")
+        for i in range(len(entities)):
+            print({
+                "cls1_index": i,
+                "paired_cls0_idxs": entities.pair_idxs[i].tolist(),
+                "paired_dists": [round(d,2) for d in entities.pair_dists[i].tolist()],
+            })
+
+        # Step 3: Harvest_leaf가 Center_leaf의 중심을 바라보게 하기 (매칭된 모든 쌍을 한 번에)
+        ii, jj = np.nonzero(entities.paired)
+        rotated, angles = rotate_boxes_edge_towards_center_by_midpoint(
+            entities.paired_boxes[ii, jj], center[ii], ref_midpoints=midpoints[ii, jj]
+        )
+        entities.rotated[ii, jj] = rotated
+        entities.rotated_angles[ii, jj] = angles
+
+        # 시각화(선택)
+        if draw:
+            for rotated_cls0, cls1_box in zip(rotated, center.boxes[ii]):
+                cv2.polylines(show_img2, [rotated_cls0.astype(np.int32).reshape(-1,1,2)], True, (0,128,255), 2)
+                # 보조선: 회전된 cls0 중심 → cls1 중심
+                c0 = rotated_cls0.mean(axis=0)
+                c1 = cls1_box.mean(axis=0)
+                cv2.circle(show_img2, (int(c0[0]), int(c0[1])), 3, (255,255,0), -1)
+                cv2.circle(show_img2, (int(c1[0]), int(c1[1])), 3, (0,255,255), -1)
+                cv2.line(show_img2, (int(c0[0]), int(c0[1])), (int(c1[0]), int(c1[1])), (255,255,0), 1)
+
+        # Step 4: Harvest_leaf를 서로 연결하고 중심을 구해 깻잎개체의 중심 구하기
+        line_info_list = []  # [( (cx, cy), slope ), ...]
+
+        # 두 박스가 모두 있어야 연결 가능
+        for rb0, rb1 in entities.rotated[entities.complete]:
+            # 두 박스에서 가장 가까운 변의 중점 계산
+            midA, midB, ia, ib, dmin = closest_edge_midpoints(rb0, rb1)
+
+            # 중점 좌표 (정수화)
+            pA = (int(round(midA[0])), int(round(midA[1])))
+            pB = (int(round(midB[0])), int(round(midB[1])))
+
+            # ③ 중심점 계산 (두 점 평균)
+            cx = (pA[0] + pB[0]) / 2
+            cy = (pA[1] + pB[1]) / 2
+
+            if draw:
                 # ① 양쪽 변 중점 시각화
                 cv2.circle(show_img3, pA, 4, (255, 0, 255), 1)
                 cv2.circle(show_img3, pB, 4, (255, 0, 255), 1)
@@ -341,69 +312,94 @@ class camera():
                 # ② 선분 그리기
                 cv2.line(show_img3, pA, pB, (255, 0, 255), 1)
 
-                # ③ 중심점 계산 (두 점 평균)
-                cx = (pA[0] + pB[0]) / 2
-                cy = (pA[1] + pB[1]) / 2
                 cv2.circle(show_img3, (int(cx), int(cy)), 5, (0, 255, 255), 1)
 
-                # ④ 선분 기울기 계산
-                dx = pB[0] - pA[0]
-                dy = pB[1] - pA[1]
-                if dx == 0:
-                    slope = float('inf')  # 수직선
-                else:
-                    slope = dy / dx
+            # ④ 선분 기울기 계산
+            dx = pB[0] - pA[0]
+            dy = pB[1] - pA[1]
+            if dx == 0:
+                slope = float('inf')  # 수직선
+            else:
+                slope = dy / dx
+
+            angle = math.atan2(dy, dx)
+            angle = math.degrees(angle)
+            if angle >= 0:
+                angle-=90
+            else:
+                angle+=90
+            angle = self.fold_angle(angle_deg=angle)
+            # 리스트에 추가
+            line_info_list.append(((cx, cy), slope, angle))
+        # ───────── 결과 출력 ─────────
+        print("\n[Line Info List]")
+        for i, (center, slope, angle) in enumerate(line_info_list):
+            cx, cy = center
+            print(f"{i+1:02d}. Center=({cx:.1f}, {cy:.1f}), Slope={slope:.3f}, Angle={angle:.3f}")
+
+        frame["line_info_list"] = line_info_list
+        frame["entities"] = entities
+        if draw:
+            frame["show_imgs"] = (show_img1, show_img2, show_img3)
+        return frame
+
+    def compose(self, frame):
+        # 시각화 스레드: 그린 프레임만 창 크기로 붙여서 메인 스레드로 전달
+        if "show_imgs" not in frame:
+            return None
+        show_img1, show_img2, show_img3 = frame["show_imgs"]
+        show = cv2.hconcat([cv2.resize(show_img1, (600,450)), cv2.resize(show_img2, (600,450)), cv2.resize(show_img3, (600,450))])
+        # show = frame["color"]
+        return show
 
-                angle = math.atan2(dy, dx)
-                angle = math.degrees(angle)
-                if angle >= 0:
-                    angle-=90
-                else:
-                    angle+=90
-                angle = self.fold_angle(angle_deg=angle)
-                # 리스트에 추가
-                line_info_list.append(((cx, cy), slope, angle))
-            center = None
-            angle = None
-            # ───────── 결과 출력 ─────────
-            print("\n[Line Info List]")
-            for i, (center, slope, angle) in enumerate(line_info_list):
-                cx, cy = center
-                print(f"{i+1:02d}. Center=({cx:.1f}, {cy:.1f}), Slope={slope:.3f}, Angle={angle:.3f}")
-                center=center
-                angle=angle
-
-            if self.click_point:
-                if center is not None:
-                    u, v = center
-                    u = u*2.0
-                    v = v*1.5
-                    print(u, v)
-
-                    di = self.angles_from_pixel(depth_for_calc, u=u, v=v)
-                    x = di.get('X')
-                    y = di.get('Y')
-                    z = di.get('Z')
-                    if di is not None:
-                        print(di.get('X'), di.get('Y'), di.get('Z'))
-                    
-                    self.indy.run(x, y, z, angle)
-                    
-                    self.click_point = False
-                else:
-                    self.click_point = False
+    def dispatch(self, frame):
+        # 수확하는 동안 이 스레드만 멈춤. 그 사이 찍힌 프레임은 수확이 끝난 뒤 버림
+        line_info_list = frame["line_info_list"]
 
-            show = cv2.hconcat([cv2.resize(show_img1, (600,450)), cv2.resize(show_img2, (600,450)), cv2.resize(show_img3, (600,450))])
-            # show = view_color
-            cv2.imshow('View', show)
+        # 로봇이 움직이는 동안 찍힌 프레임(방금 자른 잎이 보일 수 있음)은 버림
+        if frame["captured"] < self.harvest_end:
+            return None
+
+        if self.click_point or (self.auto_harvest and line_info_list):
+            # 한 프레임의 모든 깻잎을 카메라 좌표로 한 번에 변환한 뒤 연속 수확
+            # depth 정렬(rs.align)은 여기서 처음 요청될 때만 수행됨
+            depth_for_calc = frame["depth"]
+            targets = []
+            uv = self.indy.handeye.to_image([c for c, slope, angle in line_info_list])  # 320x320 -> 640x480
+
+            # 수확 대상 개체의 Center_leaf OBB 주변만 depth 후처리 (line_info_list는 complete 개체 순서)
+            refined = None
+            if self.refine_depth and len(uv):
+                entities = frame["entities"]
+                boxes = self.indy.handeye.to_image(entities.center.boxes[entities.complete]).reshape(-1, 4, 2)
+                rois = DepthRefiner.rois_from_boxes(boxes) + [(u - 8, v - 8, u + 9, v + 9) for u, v in uv.astype(int)]
+                refined = self.depth_refiner.refine(np.asanyarray(depth_for_calc.get_data()), rois)
+
+            for (u, v), (_, slope, angle) in zip(uv, line_info_list):
+                di = self.angles_from_pixel(depth_for_calc, u=u, v=v, depth=refined)
+                if di is None:
+                    continue
+                print(di.get('X'), di.get('Y'), di.get('Z'))
+                targets.append((di.get('X'), di.get('Y'), di.get('Z'), angle))
+
+            if targets:
+                self.indy.run_batch(targets)
+                self.harvest_end = time.monotonic()
+                self.q_dispatch.clear()     # 수확 중 쌓인 프레임은 다음 수확에 쓰지 않음
+            self.click_point = False
 
-            if cv2.waitKey(33) & 0xFF == ord('q'):
-                self.indy.close()
-                cv2.destroyAllWindows()
-                print("Stopping pipeline...")
-                self.pipeline.stop()
-                break
-            
 
 if __name__ == "__main__":
-    camera().start()
\ No newline at end of file
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--replay", help="RealSense 대신 Recorder로 녹화한 세션 디렉터리를 재생")
+    parser.add_argument("--realtime", action="store_true", help="녹화 시각 간격대로 재생 (기본: 최대 속도)")
+    parser.add_argument("--loop", action="store_true", help="재생이 끝나면 처음부터 반복")
+    parser.add_argument("--record", help="실행하는 동안 color/depth를 이 디렉터리에 녹화")
+    parser.add_argument("--mock", action="store_true", help="로봇/엔드이펙터 없이 모의 백엔드로 실행")
+    parser.add_argument("--headless", action="store_true", help="창 없이 실행, 검출되면 자동 수확")
+    args = parser.parse_args()
+
+    source = ReplaySource(args.replay, realtime=args.realtime, loop=args.loop) if args.replay else None
+    cam = camera(source=source, mock=args.mock, record=args.record)
+    cam.headless = args.headless
+    cam.start()
\ No newline at end of file
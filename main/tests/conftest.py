@@ -0,0 +1,5 @@
+import os
+import sys
+
+# main/ 아래 모듈을 스크립트와 같은 방식(libraries.*, utils.*)으로 import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,28 @@
+import numpy as np
+
+from utils.box_angle import rotate_box_edge_towards_center_by_midpoint, rotate_boxes_edge_towards_center_by_midpoint
+from utils.detections import Detections
+
+
+def square(cx, cy, r=5):
+    return [[cx - r, cy - r], [cx + r, cy - r], [cx + r, cy + r], [cx - r, cy + r]]
+
+
+CLS0 = np.array([square(0, 0), square(50, 40)], dtype=float)
+CLS1 = np.array([square(30, 10), square(10, 0)], dtype=float)
+REF = np.array([[5, 0], [45, 40]], dtype=float)
+
+
+def test_batch_matches_single():
+    rotated, angles = rotate_boxes_edge_towards_center_by_midpoint(CLS0, CLS1, REF)
+    for k in range(len(CLS0)):
+        r, a = rotate_box_edge_towards_center_by_midpoint(CLS0[k], CLS1[k], REF[k])
+        assert np.allclose(rotated[k], r, atol=1e-4)
+        assert np.isclose(angles[k], a)
+
+
+def test_accepts_detections():
+    expected = rotate_boxes_edge_towards_center_by_midpoint(CLS0, CLS1, REF)
+    rotated, angles = rotate_boxes_edge_towards_center_by_midpoint(Detections(CLS0), Detections(CLS1), REF)
+    assert np.allclose(rotated, expected[0])
+    assert np.allclose(angles, expected[1])
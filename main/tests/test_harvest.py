@@ -0,0 +1,42 @@
+from libraries.control import HarvestState, HarvestStateMachine
+
+GRIP_CLOSE = 950
+TARGETS = {HarvestState.GRASP: {11: GRIP_CLOSE}}
+
+
+def make_fsm():
+    calls = []
+    actions = {state: (lambda state=state: calls.append(state)) for state in HarvestState}
+    return HarvestStateMachine(actions, TARGETS), calls
+
+
+def test_grasp_to_cut_on_falling_edge():
+    fsm, calls = make_fsm()
+    fsm.update(1, 1, 0)
+    fsm.update(1, 1, 1)
+    assert fsm.state == HarvestState.GRASP
+    fsm.update(1, 1, 1, {11: GRIP_CLOSE})
+    assert fsm.settled and fsm.state == HarvestState.GRASP
+    fsm.update(0, 1, 1)
+    assert fsm.state == HarvestState.CUT
+    assert calls == [HarvestState.GRASP, HarvestState.CUT]
+
+
+def test_grasp_to_cut_when_already_low_at_entry():
+    # 그리퍼가 닫히기 전부터 포토센서가 가려져 있으면 하강 에지가 오지 않음
+    fsm, _ = make_fsm()
+    fsm.update(0, 1, 0)
+    fsm.update(0, 1, 1)
+    assert fsm.state == HarvestState.GRASP
+    fsm.update(0, 1, 1, {11: GRIP_CLOSE})
+    assert fsm.state == HarvestState.CUT
+
+
+def test_grasp_waits_while_high_after_low_entry():
+    # 진입 시 가려져 있었어도 파지 완료 시점에 열려 있으면 절단하지 않음
+    fsm, _ = make_fsm()
+    fsm.update(0, 0, 1)
+    fsm.update(1, 1, 1, {11: GRIP_CLOSE})
+    assert fsm.state == HarvestState.GRASP
+    fsm.update(1, 1, 1)
+    assert fsm.state == HarvestState.GRASP
@@ -0,0 +1,20 @@
+from utils.harvest_plan import plan_harvest_order
+
+# 카메라 좌표(m), Y는 아래쪽이 +
+POINTS = [
+    (0.10, 0.20, 0.3),      # 0: 아래 행 오른쪽
+    (-0.10, 0.21, 0.3),     # 1: 아래 행 왼쪽
+    (0.00, 0.20, 0.3),      # 2: 아래 행 가운데
+    (0.05, 0.00, 0.3),      # 3: 위 행 오른쪽
+    (-0.05, 0.01, 0.3),     # 4: 위 행 왼쪽
+]
+
+
+def test_rows_bottom_to_top_left_to_right():
+    assert plan_harvest_order(POINTS) == [1, 2, 0, 4, 3]
+
+
+def test_optimize_keeps_row_order():
+    order = plan_harvest_order(POINTS, optimize=True)
+    assert sorted(order[:3]) == [0, 1, 2]
+    assert sorted(order[3:]) == [3, 4]
@@ -0,0 +1,33 @@
+import numpy as np
+
+from utils.pairing import pair_midpoints
+
+
+def square(cx, cy, r=5):
+    return [[cx - r, cy - r], [cx + r, cy - r], [cx + r, cy + r], [cx - r, cy + r]]
+
+
+MIDPOINTS = np.array([[[0, 0], [100, 0]]], dtype=float)     # Center_leaf 1개의 긴 변 중점 2개
+BOXES = np.array([square(-10, 0), square(200, 0)], dtype=float)
+
+
+def test_no_gate_pairs_nearest():
+    pair_idxs, pair_dists = pair_midpoints(MIDPOINTS, BOXES)
+    assert pair_idxs.tolist() == [[0, 1]]
+    assert np.allclose(pair_dists, [[5, 95]])
+
+
+def test_no_gate_keeps_nearest_rule_for_competing_midpoint():
+    # 두 중점 모두 A가 가장 가까움 -> A는 한쪽만, 다른 쪽은 멀리 있는 B로 채우지 않고 -1
+    boxes = np.array([square(-10, 0), square(0, 500)], dtype=float)
+    pair_idxs, pair_dists, dropped = pair_midpoints(MIDPOINTS, boxes, return_dropped=True)
+    assert pair_idxs.tolist() == [[0, -1]]
+    assert np.isinf(pair_dists[0, 1])
+    assert dropped == 1
+
+
+def test_gate_drops_and_counts_far_pairs():
+    pair_idxs, pair_dists, dropped = pair_midpoints(MIDPOINTS, BOXES, max_dist=40, return_dropped=True)
+    assert pair_idxs.tolist() == [[0, -1]]
+    assert np.isinf(pair_dists[0, 1])
+    assert dropped == 1
@@ -0,0 +1,49 @@
+import time
+
+import pytest
+
+from libraries.pipeline import Pipeline
+
+
+def wait_until(cond, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not cond() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return cond()
+
+
+def test_repeated_failures_stop_pipeline():
+    def broken(item):
+        raise ValueError('bad frame')
+
+    pipe = Pipeline(max_errors=3)
+    q = pipe.queue('items')
+    pipe.add('source', lambda: (time.sleep(0.01), 1)[1], outboxes=[q])
+    pipe.add('broken', broken, inbox=q)
+
+    with pytest.raises(RuntimeError, match='broken') as info:
+        with pipe:
+            assert wait_until(lambda: pipe.failed)
+    assert isinstance(info.value.__cause__, ValueError)
+    assert pipe.stage('broken').errors == 3
+    assert not pipe.stage('source').is_alive()
+
+
+def test_occasional_failure_keeps_running():
+    calls = []
+
+    def flaky(item):
+        calls.append(item)
+        if len(calls) % 2:
+            raise ValueError('odd frame')
+        return item
+
+    pipe = Pipeline(max_errors=2)
+    q = pipe.queue('items')
+    pipe.add('source', lambda: (time.sleep(0.01), 1)[1], outboxes=[q])
+    pipe.add('flaky', flaky, inbox=q)
+
+    with pipe:
+        assert wait_until(lambda: len(calls) >= 6)
+        assert not pipe.failed
+    assert pipe.stage('flaky').errors >= 3
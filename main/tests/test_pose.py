@@ -0,0 +1,28 @@
+import numpy as np
+
+from libraries.transform import pose_to_matrix, matrix_to_pose, compose_pose
+
+
+def test_round_trip():
+    pose = [0.3, -0.2, 0.5, 10.0, 20.0, -30.0]
+    assert np.allclose(matrix_to_pose(pose_to_matrix(pose)), pose)
+
+
+def test_round_trip_keeps_reference_branch():
+    # v = 180은 (u+180, 0, w+180)과 같은 회전이지만 ref 쪽 표현을 유지
+    pose = [0.35, -0.19, 0.52, 0.0, 180.0, 0.0]
+    assert np.allclose(matrix_to_pose(pose_to_matrix(pose), ref=pose), pose)
+
+
+def test_offset_is_applied_in_tool_frame():
+    # 도구가 아래를 보도록 뒤집힌 자세(v = 180)에서 도구 +x 이동은 기준 좌표계 -x
+    pose = [0.35, -0.19, 0.52, 0.0, 180.0, 0.0]
+    target = compose_pose(pose, [0.1, 0.0, 0.05, 0, 0, 0])
+    assert np.allclose(target, [0.25, -0.19, 0.47, 0.0, 180.0, 0.0])
+
+
+def test_offset_rotation_composes():
+    pose = [0.0, 0.0, 0.0, 0.0, 0.0, 30.0]
+    target = compose_pose(pose, [0.1, 0.0, 0.0, 0, 0, 15.0])
+    assert np.allclose(target[3:], [0.0, 0.0, 45.0])
+    assert np.allclose(target[:2], [0.1 * np.cos(np.radians(30)), 0.1 * np.sin(np.radians(30))])
@@ -0,0 +1,24 @@
+import pytest
+
+from libraries.source import FrameSource
+
+
+def test_incomplete_source_fails_at_construction():
+    class NoRead(FrameSource):
+        def start(self):
+            return 0.001
+
+    with pytest.raises(TypeError):
+        NoRead()
+
+
+def test_complete_source_constructs():
+    class Empty(FrameSource):
+        def start(self):
+            return 0.001
+
+        def read(self):
+            return None
+
+    source = Empty()
+    assert source.start() == 0.001 and source.read() is None and not source.finished
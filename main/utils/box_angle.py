@@ -80,3 +80,47 @@ def rotate_box_edge_towards_center_by_midpoint(cls0_xyxyxyxy, cls1_xyxyxyxy, ref
 
     rotated = _rotate_points_around_center(cls0, c0, delta)
     return rotated, math.degrees(curr_theta + delta)
+
+def rotate_boxes_edge_towards_center_by_midpoint(cls0_boxes, cls1_boxes, ref_midpoints):
+    """
+    rotate_box_edge_towards_center_by_midpoint의 배치 버전 (N개를 한 번에)
+    cls0_boxes: (N,4,2), cls1_boxes: (N,4,2) 또는 utils.detections.Detections, ref_midpoints: (N,2)
+    반환: (rotated (N,4,2) float32, new_angle_deg (N,))
+    """
+    cls0 = np.asarray(getattr(cls0_boxes, 'boxes', cls0_boxes), dtype=float).reshape(-1, 4, 2)
+    cls1 = np.asarray(getattr(cls1_boxes, 'boxes', cls1_boxes), dtype=float).reshape(-1, 4, 2)
+    ref = np.asarray(ref_midpoints, dtype=float).reshape(-1, 2)
+    n = np.arange(len(cls0))
+
+    # 목표 방향: C0 -> C1
+    c0 = cls0.mean(axis=1)                                          # (N,2)
+    t = cls1.mean(axis=1) - c0
+    tgt_theta = np.arctan2(t[:, 1], t[:, 0])
+
+    # ref_midpoint에 가장 가까운 변 선택 (점-선분 거리)
+    ab = np.roll(cls0, -1, axis=1) - cls0                           # (N,4,2)
+    ap = ref[:, None, :] - cls0
+    ab2 = np.einsum('nki,nki->nk', ab, ab)
+    s = np.einsum('nki,nki->nk', ap, ab)
+    s = np.clip(np.divide(s, ab2, out=np.zeros_like(s), where=ab2 > 0.0), 0.0, 1.0)
+    diff = ap - s[..., None] * ab
+    eidx = np.einsum('nki,nki->nk', diff, diff).argmin(axis=1)
+
+    # 선택된 변의 단위 방향벡터와 두 법선 후보(변의 좌/우)
+    v = ab[n, eidx]
+    u = v / (np.linalg.norm(v, axis=1, keepdims=True) + 1e-9)
+    normals = np.stack([np.stack([-u[:, 1], u[:, 0]], axis=1),
+                        np.stack([u[:, 1], -u[:, 0]], axis=1)], axis=1)      # (N,2,2)
+
+    # 목표와 가장 일치(내적 최대)하는 법선 선택
+    d = t / (np.linalg.norm(t, axis=1, keepdims=True) + 1e-9)
+    dots = np.einsum('nki,ni->nk', normals, d)
+    nrm = normals[n, dots.argmax(axis=1)]
+    curr_theta = np.arctan2(nrm[:, 1], nrm[:, 0])
+
+    # 필요한 회전량만큼 중심 기준 회전 (N개의 2x2 회전 행렬)
+    delta = tgt_theta - curr_theta
+    c, sn = np.cos(delta), np.sin(delta)
+    R = np.stack([np.stack([c, -sn], axis=1), np.stack([sn, c], axis=1)], axis=1)   # (N,2,2)
+    rotated = c0[:, None, :] + np.einsum('nij,nkj->nki', R, cls0 - c0[:, None, :])
+    return rotated.astype(np.float32), np.degrees(curr_theta + delta)
@@ -0,0 +1,118 @@
+import numpy as np
+
+# 검출 결과/깻잎 개체를 numpy 배열로 보관하는 표현
+# result[0].obb의 텐서를 한 번만 numpy로 옮기고, 이후에는 tolist()나 프레임마다의 딕셔너리 없이 배열 연산으로 처리
+
+class Detections:
+    """
+    한 프레임의 OBB 검출 N개
+    boxes: (N,4,2) 꼭짓점, xywhr: (N,5) 중심/크기/회전(rad), cls: (N,) int, conf: (N,)
+    """
+    __slots__ = ('boxes', 'xywhr', 'cls', 'conf')
+
+    def __init__(self, boxes, xywhr=None, cls=None, conf=None):
+        self.boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4, 2)
+        n = len(self.boxes)
+        self.xywhr = np.zeros((n, 5), np.float32) if xywhr is None else np.asarray(xywhr, dtype=np.float32).reshape(n, 5)
+        self.cls   = np.zeros(n, int) if cls is None else np.asarray(cls).astype(int).reshape(n)
+        self.conf  = np.ones(n, np.float32) if conf is None else np.asarray(conf, dtype=np.float32).reshape(n)
+
+    @classmethod
+    def from_obb(cls, obb):
+        """
+        obb: ultralytics Results.obb
+        """
+        return cls(obb.xyxyxyxy.cpu().numpy(), obb.xywhr.cpu().numpy(),
+                   obb.cls.cpu().numpy(), obb.conf.cpu().numpy())
+
+    def __len__(self):
+        return len(self.boxes)
+
+    def __getitem__(self, idx):
+        """
+        idx: 불리언 마스크/인덱스 배열 -> 해당 검출만 담은 Detections
+        """
+        return Detections(self.boxes[idx], self.xywhr[idx], self.cls[idx], self.conf[idx])
+
+    @property
+    def centers(self):
+        """(N,2) 꼭짓점 평균"""
+        return self.boxes.mean(axis=1)
+
+    @property
+    def edge_midpoints(self):
+        """(N,4,2) 각 변(0-1,1-2,2-3,3-0)의 중점"""
+        return (self.boxes + np.roll(self.boxes, -1, axis=1)) / 2.0
+
+    @property
+    def edge_lengths(self):
+        """(N,4) 각 변의 길이"""
+        return np.linalg.norm(np.roll(self.boxes, -1, axis=1) - self.boxes, axis=2)
+
+    def long_edge_index(self):
+        """
+        (N,2) 가장 긴 변과 마주보는 변의 인덱스
+        길이 차가 최대 길이의 0.1% 이내인 변은 같은 길이로 보며,
+        정확히 두 변이 최대면 그 두 변을, 아니면 첫 번째 최대 변과 그 반대 변을 사용
+        """
+        lengths = self.edge_lengths
+        near = np.abs(lengths - lengths.max(axis=1, keepdims=True)) < 1e-3 * lengths.max(axis=1, keepdims=True)
+        first = near.argmax(axis=1)
+        second = np.where(near.sum(axis=1) == 2,
+                          3 - near[:, ::-1].argmax(axis=1),     # 두 번째(마지막) 최대 변
+                          (first + 2) % 4)
+        return np.stack([first, second], axis=1)
+
+    @property
+    def long_edge_midpoints(self):
+        """(N,2,2) 가장 긴 두 변의 중점"""
+        idx = self.long_edge_index()
+        return np.take_along_axis(self.edge_midpoints, idx[:, :, None], axis=1)
+
+    @property
+    def angles(self):
+        """(N,) 가장 긴 변의 방향(deg)"""
+        idx = self.long_edge_index()[:, 0]
+        n = np.arange(len(self))
+        v = self.boxes[n, (idx + 1) % 4] - self.boxes[n, idx]
+        return np.degrees(np.arctan2(v[:, 1], v[:, 0]))
+
+
+class Entities:
+    """
+    Center_leaf 하나와 그 양쪽에 매칭된 Harvest_leaf 최대 2개로 이루어진 깻잎 개체 E개
+    center: Detections (E), harvest: Detections (B)
+    midpoints: (E,2,2) Center_leaf 긴 변 중점, pair_idxs: (E,2) harvest 인덱스(-1 미매칭), pair_dists: (E,2)
+    rotated: (E,2,4,2) Center_leaf를 바라보도록 회전한 Harvest_leaf (미매칭은 nan), rotated_angles: (E,2)
+    """
+    __slots__ = ('center', 'harvest', 'midpoints', 'pair_idxs', 'pair_dists', 'rotated', 'rotated_angles')
+
+    def __init__(self, center, harvest, midpoints, pair_idxs, pair_dists):
+        self.center     = center
+        self.harvest    = harvest
+        self.midpoints  = np.asarray(midpoints, dtype=float).reshape(-1, 2, 2)
+        self.pair_idxs  = np.asarray(pair_idxs, dtype=int).reshape(-1, 2)
+        self.pair_dists = np.asarray(pair_dists, dtype=float).reshape(-1, 2)
+        self.rotated        = np.full((len(self.pair_idxs), 2, 4, 2), np.nan)
+        self.rotated_angles = np.full((len(self.pair_idxs), 2), np.nan)
+
+    def __len__(self):
+        return len(self.pair_idxs)
+
+    @property
+    def paired(self):
+        """(E,2) 매칭 여부"""
+        return self.pair_idxs != -1
+
+    @property
+    def complete(self):
+        """(E,) 양쪽 모두 매칭된 개체"""
+        return self.paired.all(axis=1)
+
+    @property
+    def paired_boxes(self):
+        """(E,2,4,2) 매칭된 Harvest_leaf 꼭짓점, 미매칭은 nan"""
+        out = np.full((len(self), 2, 4, 2), np.nan)
+        mask = self.paired
+        out[mask] = self.harvest.boxes[self.pair_idxs[mask]]
+        return out
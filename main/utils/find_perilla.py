@@ -5,7 +5,10 @@ from sklearn.cluster import KMeans
 # xywhr     = result[0].obb.xywhr.tolist()
 # xyxyxyxy  = result[0].obb.xyxyxyxy.tolist()
 # 왼쪽 아래에서 부터 순서대로 오른쪽 위까지 정렬
-def harvest_order(xywhr, xyxyxyxy):
+# xywhr 자리에 utils.detections.Detections를 바로 넘겨도 됨 (xyxyxyxy 생략)
+def harvest_order(xywhr, xyxyxyxy=None):
+    if hasattr(xywhr, 'xywhr'):
+        xywhr, xyxyxyxy = xywhr.xywhr.tolist(), xywhr.boxes.tolist()
     ho = list(zip(xywhr, xyxyxyxy))
     ho = sorted(ho, key=lambda x: -x[0][1])
 
@@ -0,0 +1,112 @@
+import numpy as np
+
+# 여러 깻잎을 한 번에 수확할 때의 방문 순서 계획
+# points: 카메라 좌표계 [(X, Y, Z), ...] (m), Y는 아래쪽이 +
+# README 작동 절차대로 좌하단 -> 우상단 순서를 지키기 위해 높이(Y)로 행을 나눠 아래 행부터, 각 행은 왼쪽부터 방문
+# optimize=True면 행 순서만 지키고 행 안에서는 nearest-neighbour + 2-opt로 이동 거리를 줄임 (행을 오른쪽부터 훑을 수 있음)
+
+def group_rows(points, row_threshold=0.05):
+    """
+    points: (N,3)
+    row_threshold: 같은 행으로 묶을 높이 차(m)
+    return: [[idx, ...], ...] 아래 행부터 위 행 순서, 각 행은 왼쪽(X 작은 쪽)부터 정렬
+    """
+    pts = np.asarray(points, dtype=float).reshape(-1, 3)
+    rows = []
+    prev_y = None
+    for k in np.argsort(-pts[:, 1], kind='stable'):
+        y = pts[k, 1]
+        if prev_y is None or abs(y - prev_y) > row_threshold:
+            rows.append([])
+            prev_y = y
+        rows[-1].append(int(k))
+    return [sorted(row, key=lambda k: pts[k, 0]) for row in rows]
+
+def path_length(points, order, start=None):
+    """
+    order 순서로 방문할 때의 총 이동 거리, start가 있으면 start에서 출발
+    """
+    pts = np.asarray(points, dtype=float).reshape(-1, 3)
+    seq = pts[order]
+    if start is not None:
+        seq = np.vstack([np.asarray(start, dtype=float).reshape(1, 3), seq])
+    if len(seq) < 2:
+        return 0.0
+    return float(np.linalg.norm(np.diff(seq, axis=0), axis=1).sum())
+
+def nearest_neighbor(points, idxs, start):
+    """
+    start: (3,) 출발 위치
+    return: idxs를 start에서 가장 가까운 점부터 차례로 방문하는 순서
+    """
+    pts = np.asarray(points, dtype=float).reshape(-1, 3)
+    left = list(idxs)
+    order = []
+    cur = np.asarray(start, dtype=float)
+    while left:
+        ds = np.linalg.norm(pts[left] - cur, axis=1)
+        k = left.pop(int(np.argmin(ds)))
+        order.append(k)
+        cur = pts[k]
+    return order
+
+def two_opt(points, order, start=None, max_iter=100):
+    """
+    열린 경로(끝점 복귀 없음)에 대한 2-opt 개선
+    start가 있으면 start -> order[0] 구간도 비용에 포함 (출발 위치 고정)
+    return: 개선된 순서
+    """
+    pts = np.asarray(points, dtype=float).reshape(-1, 3)
+    order = list(order)
+    n = len(order)
+    if n < 2:
+        return order
+
+    def at(i):
+        # i == -1 은 출발 위치
+        return np.asarray(start, dtype=float) if i < 0 else pts[order[i]]
+
+    def d(a, b):
+        return float(np.linalg.norm(a - b))
+
+    first = 0 if start is not None else 1
+    for _ in range(max_iter):
+        improved = False
+        for i in range(first, n - 1):
+            for j in range(i + 1, n):
+                # 구간 order[i..j]를 뒤집음: (i-1, i) + (j, j+1) -> (i-1, j) + (i, j+1)
+                a, b = at(i - 1), at(i)
+                c = at(j)
+                before = d(a, b)
+                after  = d(a, c)
+                if j + 1 < n:
+                    e = at(j + 1)
+                    before += d(c, e)
+                    after  += d(b, e)
+                if after < before - 1e-9:
+                    order[i:j+1] = order[i:j+1][::-1]
+                    improved = True
+        if not improved:
+            break
+    return order
+
+def plan_harvest_order(points, start=None, row_threshold=0.05, optimize=False):
+    """
+    points: [(X, Y, Z), ...] 카메라 좌표(m)
+    return: 방문할 인덱스 순서
+    기본: 아래 행 -> 위 행, 각 행은 왼쪽 -> 오른쪽 (README 좌하단 -> 우상단 순서)
+    optimize=True: 아래 행 -> 위 행 순서만 고정하고, 각 행 안에서 이전 행의 마지막 위치를 출발점으로 경로를 최적화
+    start: optimize=True일 때 출발 위치, None이면 가장 아래 행의 가장 왼쪽 점에서 출발
+    """
+    pts = np.asarray(points, dtype=float).reshape(-1, 3)
+    if not optimize:
+        return [k for row in group_rows(pts, row_threshold) for k in row]
+
+    order = []
+    cur = None if start is None else np.asarray(start, dtype=float)
+    for row in group_rows(pts, row_threshold):
+        row_start = pts[row[0]] if cur is None else cur
+        row_order = two_opt(pts, nearest_neighbor(pts, row, row_start), start=row_start)
+        order.extend(row_order)
+        cur = pts[row_order[-1]]
+    return order
@@ -28,6 +28,44 @@ def dist_point_to_box_boundary(p, box_xyxyxyxy):
     dists = [point_to_segment_distance(p, pts[i], pts[j]) for i, j in edges]
     return min(dists)
 
+def point_box_distance_matrix(points, boxes_xyxyxyxy):
+    """
+    points: [(x,y), ...] 또는 (P,2)
+    boxes_xyxyxyxy: [[x1,y1,...,x4,y4], ...], (B,4,2) 또는 utils.detections.Detections
+    return: (P,B) 점 p에서 박스 b '테두리'까지 최소거리
+    모든 점 x 박스 x 변 (P,B,4) 선분 거리를 한 번의 브로드캐스트로 계산
+    """
+    pts = np.asarray(points, dtype=float).reshape(-1, 2)
+    a = np.asarray(getattr(boxes_xyxyxyxy, 'boxes', boxes_xyxyxyxy), dtype=float).reshape(-1, 4, 2)   # (B,4,2) 변 시작점
+    ab = np.roll(a, -1, axis=1) - a                                 # (B,4,2) 변 0-1,1-2,2-3,3-0
+    ab2 = np.einsum('bki,bki->bk', ab, ab)                          # (B,4)
+
+    ap = pts[:, None, None, :] - a[None]                            # (P,B,4,2)
+    t = np.einsum('pbki,bki->pbk', ap, ab)
+    t = np.divide(t, ab2, out=np.zeros_like(t), where=ab2 > 0.0)    # 퇴화(길이 0) 변은 시작점까지 거리
+    np.clip(t, 0.0, 1.0, out=t)
+
+    diff = ap - t[..., None] * ab                                   # (P,B,4,2) 투영점 -> p
+    d = np.sqrt(np.einsum('pbki,pbki->pbk', diff, diff))            # (P,B,4)
+    return d.min(axis=2)
+
+def nearest_boxes(points, boxes_xyxyxyxy, max_dist=None):
+    """
+    return: (idxs, dists) numpy 배열 (P,)
+    idxs[i]  = i번째 점에 가장 가까운 박스 인덱스(없거나 max_dist 초과면 -1)
+    dists[i] = 그 최소거리(박스가 없으면 inf)
+    """
+    n = len(points)
+    if len(boxes_xyxyxyxy) == 0 or n == 0:
+        return np.full(n, -1, dtype=int), np.full(n, np.inf)
+
+    dmat = point_box_distance_matrix(points, boxes_xyxyxyxy)       # (P,B)
+    idxs = dmat.argmin(axis=1)
+    dists = dmat[np.arange(len(idxs)), idxs]
+    if max_dist is not None:
+        idxs = np.where(dists > max_dist, -1, idxs)
+    return idxs, dists
+
 def assign_points_to_nearest_box(points, boxes_xyxyxyxy, max_dist=None):
     """
     points: [(x,y), ...]
@@ -37,21 +75,8 @@ def assign_points_to_nearest_box(points, boxes_xyxyxyxy, max_dist=None):
     idxs[i]  = i번째 점에 가장 가까운 박스 인덱스(없으면 -1)
     dists[i] = 그 최소거리
     """
-    if len(boxes_xyxyxyxy) == 0:
-        return [-1]*len(points), [float('inf')]*len(points)
-
-    idxs, dists = [], []
-    for p in points:
-        ds = [dist_point_to_box_boundary(p, b) for b in boxes_xyxyxyxy]
-        k = int(np.argmin(ds))
-        dmin = ds[k]
-        if (max_dist is not None) and (dmin > max_dist):
-            idxs.append(-1)
-            dists.append(dmin)
-        else:
-            idxs.append(k)
-            dists.append(dmin)
-    return idxs, dists
+    idxs, dists = nearest_boxes(points, boxes_xyxyxyxy, max_dist)
+    return idxs.tolist(), dists.tolist()
 
 
 
@@ -0,0 +1,50 @@
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+from utils.nearest_box import point_box_distance_matrix
+
+# Center_leaf 긴 변 중점 <-> Harvest_leaf 박스 1:1 매칭
+# 중점마다 가장 가까운 박스를 고른 뒤 중복을 욕심쟁이로 지우는 대신,
+# 전체 거리 합이 최소가 되도록 헝가리안(linear_sum_assignment)으로 한 번에 푼다
+# 임계 거리가 없으면 기존 규칙처럼 각 중점은 자기에게 가장 가까운 박스와만 매칭될 수 있음
+# (그 박스를 다른 중점이 가져가면 -1, 멀리 떨어진 다른 박스로 대신 채우지 않음)
+
+_GATED = 1e9    # 허용되지 않는 쌍의 비용 (inf는 해가 없을 수 있어 큰 유한값 사용)
+
+def pair_midpoints(midpoints, harvest_boxes, max_dist=None, return_dropped=False):
+    """
+    midpoints: (E,2,2) Center_leaf E개의 긴 변 중점 2개씩
+    harvest_boxes: (B,4,2), [[x1,y1,...,x4,y4], ...] 또는 utils.detections.Detections
+    max_dist: 이 거리(px)를 넘는 쌍은 매칭하지 않음
+              (None이면 거리 제한 대신 각 중점의 가장 가까운 박스만 허용, 기존 규칙과 같은 결과)
+    return: (pair_idxs, pair_dists), return_dropped=True면 (pair_idxs, pair_dists, dropped)
+      pair_idxs  (E,2) int   : 각 중점에 매칭된 박스 인덱스, 없으면 -1
+      pair_dists (E,2) float : 그 거리, 없으면 inf
+      dropped    int         : 배정되었지만 허용되지 않는 쌍이라 버린 수 (수확 수가 줄었을 때 진단용)
+    한 박스는 최대 한 중점에만 매칭되므로 엔티티 안/엔티티 사이 중복이 모두 없음
+    """
+    mids = np.asarray(midpoints, dtype=float).reshape(-1, 2, 2)
+    E = len(mids)
+    pair_idxs = np.full(2 * E, -1, dtype=int)
+    pair_dists = np.full(2 * E, np.inf)
+    dropped = 0
+    if E == 0 or len(harvest_boxes) == 0:
+        out = pair_idxs.reshape(E, 2), pair_dists.reshape(E, 2)
+        return out + (dropped,) if return_dropped else out
+
+    dmat = point_box_distance_matrix(mids.reshape(-1, 2), harvest_boxes)   # (2E,B)
+    if max_dist is None:
+        allowed = dmat <= dmat.min(axis=1, keepdims=True)
+    else:
+        allowed = dmat <= max_dist
+    cost = np.where(allowed, dmat, _GATED)
+
+    rows, cols = linear_sum_assignment(cost)
+    keep = allowed[rows, cols]
+    dropped = int((~keep).sum())
+    rows, cols = rows[keep], cols[keep]
+
+    pair_idxs[rows] = cols
+    pair_dists[rows] = dmat[rows, cols]
+    out = pair_idxs.reshape(E, 2), pair_dists.reshape(E, 2)
+    return out + (dropped,) if return_dropped else out